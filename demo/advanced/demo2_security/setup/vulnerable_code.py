@@ -7,11 +7,17 @@ DO NOT use this code in production! It's designed to show how Copilot detects se
 """
 
 import hashlib
-import sqlite3
+import sys
 import jwt
 import requests
 from flask import Flask, request, jsonify
 from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # demo/advanced, for demo_common
+from demo_common.passwords import PASSWORD_HASH_ITERATIONS, hash_password, verify_password
+from demo_common.sqlite_pool import SQLitePool
 
 app = Flask(__name__)
 
@@ -24,54 +30,66 @@ API_KEY = "sk-1234567890abcdef"  # Copilot will warn about exposed keys
 class UserManager:
     """User management with multiple security vulnerabilities"""
 
-    def __init__(self):
+    def __init__(self, password_iterations=PASSWORD_HASH_ITERATIONS,
+                 db_pool: Optional[SQLitePool] = None):
         self.users = {}  # ❌ Using dict instead of proper data structure
-        self.db_connection = None  # ❌ No dependency injection
+        self.users_by_email = {}  # Unique email -> user_id index
+        self.next_user_id = 1
+        self.db_pool = db_pool or SQLitePool('users.db')
+        self.password_iterations = password_iterations
+        # Verified against for unknown emails so timing doesn't reveal them
+        self._dummy_hash = None
 
     def createUser(self, name, email, password):  # ❌ Naming convention
         """❌ Missing type hints and proper validation"""
         if not name:  # ❌ Insufficient validation
             return False
 
-        # ❌ SECURITY ISSUE 2: Direct password storage (security issue)
-        user_id = len(self.users) + 1  # ❌ Poor ID generation
+        if email in self.users_by_email:
+            return False
+
+        user_id = self.next_user_id
+        self.next_user_id += 1
         self.users[user_id] = {
             'name': name,
             'email': email,
-            'password': password,  # ❌ Plain text password
+            'password_hash': hash_password(password, self.password_iterations),
             'created': datetime.now()
         }
+        self.users_by_email[email] = user_id
         return user_id
 
     def get_user(self, user_id):  # ❌ Inconsistent naming, no error handling
         return self.users[user_id]  # ❌ KeyError potential
 
-    # ❌ SECURITY ISSUE 3: SQL Injection vulnerability
-    def get_user_by_id_vulnerable(self, user_id):
-        """SQL Injection vulnerability - Copilot will suggest parameterized queries"""
-        conn = sqlite3.connect('users.db')
-        cursor = conn.cursor()
+    def deleteUser(self, user_id):
+        user = self.users.pop(user_id)
+        del self.users_by_email[user['email']]
+        return True
 
-        # Vulnerable: Direct string concatenation
-        query = f"SELECT * FROM users WHERE id = {user_id}"  # Copilot will flag this
-        cursor.execute(query)
+    def get_user_by_id(self, user_id):
+        """Look up a user row through the shared pool with a parameterized query"""
+        with self.db_pool.connection() as conn:
+            return conn.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
 
-        result = cursor.fetchone()
-        conn.close()
-        return result
-
-    # ❌ SECURITY ISSUE 4: Method doing too many things and exposing sensitive data
+    # ❌ SECURITY ISSUE 4: Method doing too many things
     def authenticateAndGetProfile(self, email, password):
-        for user_id, user in self.users.items():
-            if user['email'] == email and user['password'] == password:  # ❌ Plain text comparison
-                # ❌ Returning sensitive data
-                return {
-                    'id': user_id,
-                    'name': user['name'],
-                    'email': user['email'],
-                    'password': user['password']  # ❌ Exposing password
-                }
-        return None
+        user_id = self.users_by_email.get(email)
+        if user_id is None:
+            if self._dummy_hash is None:
+                self._dummy_hash = hash_password('', self.password_iterations)
+            verify_password(password, self._dummy_hash)
+            return None
+
+        user = self.users[user_id]
+        if not verify_password(password, user['password_hash']):
+            return None
+
+        return {
+            'id': user_id,
+            'name': user['name'],
+            'email': user['email']
+        }
 
 
 # ❌ SECURITY ISSUE 5: Weak password hashing
@@ -0,0 +1,263 @@
+"""
+Demo 3: In-Process Async Services
+================================
+
+Reference implementations of the async service interfaces, backed by
+InMemoryRepository. The order service fans out to the product service
+with bounded concurrency and a per-call timeout.
+"""
+
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, TypeVar
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # demo/advanced, for demo_common
+from demo_common.passwords import hash_password, verify_password
+
+from base_models import InMemoryRepository, Order, Product, User
+from order_status import OrderEventStream, OrderStatusReadModel, order_status_event
+from search import ProductSearchEngine
+from service_interfaces import (AsyncOrderServiceInterface, AsyncProductServiceInterface,
+                                AsyncUserServiceInterface)
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 10
+DEFAULT_TIMEOUT = 5.0
+
+
+async def gather_bounded(awaitables: Iterable[Awaitable[T]], limit: int = DEFAULT_CONCURRENCY,
+                         timeout: Optional[float] = DEFAULT_TIMEOUT) -> List[T]:
+    """
+    Await many calls with at most limit in flight, each bounded by timeout.
+    If any call fails the rest are cancelled and the error is raised.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(awaitable: Awaitable[T]) -> T:
+        async with semaphore:
+            return await asyncio.wait_for(awaitable, timeout)
+
+    tasks = [asyncio.ensure_future(run(awaitable)) for awaitable in awaitables]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+class InProcessProductService(AsyncProductServiceInterface):
+    """
+    Product service over an in-memory repository. Inventory changes run
+    without awaiting in between, so they are atomic on the event loop.
+    """
+
+    def __init__(self, products: Optional[InMemoryRepository] = None):
+        self.products = products or InMemoryRepository(Product)
+        self.search_engine = ProductSearchEngine()
+        self.search_engine.load(self.products.get_many(self.products.rows).values())
+
+    async def create_product(self, product_data: Dict[str, Any]) -> Product:
+        product = self.products.create(product_data)
+        self.search_engine.add(product)
+        return product
+
+    async def update_product(self, product_id: int, product_data: Dict[str, Any]) -> Optional[Product]:
+        product = self.products.update(product_id, product_data)
+        if product is not None:
+            self.search_engine.update(product)
+        return product
+
+    async def delete_product(self, product_id: int) -> bool:
+        self.search_engine.remove(product_id)
+        return self.products.delete(product_id)
+
+    async def get_products(self, product_ids: Iterable[int]) -> Dict[int, Product]:
+        return self.products.get_many(product_ids)
+
+    async def check_availability(self, product_id: int, quantity: int) -> bool:
+        product = self.products.get_by_id(product_id)
+        return product is not None and product.stock_quantity >= quantity
+
+    async def reserve_items(self, items: List[Dict[str, Any]]) -> bool:
+        requested: Dict[int, int] = {}
+        for item in items:
+            requested[item['product_id']] = requested.get(item['product_id'], 0) + item['quantity']
+
+        products = self.products.get_many(requested)
+        if any(product_id not in products or products[product_id].stock_quantity < quantity
+               for product_id, quantity in requested.items()):
+            return False
+
+        self.products.update_many({
+            product_id: {'stock_quantity': products[product_id].stock_quantity - quantity}
+            for product_id, quantity in requested.items()
+        })
+        return True
+
+    async def update_inventory(self, product_id: int, quantity_change: int) -> bool:
+        product = self.products.get_by_id(product_id)
+        if product is None or product.stock_quantity + quantity_change < 0:
+            return False
+        self.products.update(product_id, {'stock_quantity': product.stock_quantity + quantity_change})
+        return True
+
+    async def get_products_by_category(self, category_id: int) -> List[Product]:
+        return list(self.products.get_many(self.search_engine.get_by_category(category_id)).values())
+
+    async def search_products(self, query: str, filters: Dict[str, Any]) -> List[Product]:
+        """Match all query words in name/description; filters: category_id, min_price, max_price, limit"""
+        product_ids = self.search_engine.search(query, **filters)
+        return list(self.products.get_many(product_ids).values())
+
+
+class InProcessOrderService(AsyncOrderServiceInterface):
+    """
+    Order service that calls the product service concurrently, never
+    more than `concurrency` calls at once and each within `timeout`.
+    """
+
+    def __init__(self, product_service: InProcessProductService,
+                 orders: Optional[InMemoryRepository] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, timeout: float = DEFAULT_TIMEOUT,
+                 events: Optional[OrderEventStream] = None):
+        self.product_service = product_service
+        self.orders = orders or InMemoryRepository(Order)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.events = events or OrderEventStream()
+        self.status_model = OrderStatusReadModel(self.events)
+
+    def _set_status(self, order_id: int, status: str) -> Order:
+        order = self.orders.update(order_id, {'status': status})
+        self.events.publish(order_status_event(order))
+        return order
+
+    async def create_order(self, user_id: int, items: List[Dict[str, Any]]) -> Order:
+        if not items:
+            raise ValueError("Order must contain at least one item")
+
+        available = await gather_bounded(
+            (self.product_service.check_availability(item['product_id'], item['quantity'])
+             for item in items),
+            self.concurrency, self.timeout
+        )
+        if not all(available):
+            raise ValueError("One or more items are not available")
+
+        reserved = await asyncio.wait_for(self.product_service.reserve_items(items), self.timeout)
+        if not reserved:
+            raise ValueError("Items could not be reserved")
+
+        products = await asyncio.wait_for(
+            self.product_service.get_products(item['product_id'] for item in items), self.timeout
+        )
+        order_items = [
+            dict(item, price=products[item['product_id']].price) for item in items
+        ]
+        order = self.orders.create({
+            'user_id': user_id,
+            'items': order_items,
+            'total_amount': sum(item['price'] * item['quantity'] for item in order_items),
+            'status': 'pending'
+        })
+        self.events.publish(order_status_event(order))
+        return order
+
+    async def get_orders_for_user(self, user_id: int) -> List[Order]:
+        orders = self.orders.get_many(self.orders.rows)
+        return [order for order in orders.values() if order.user_id == user_id]
+
+    async def process_payment(self, order_id: int, payment_info: Dict[str, Any]) -> bool:
+        order = self.orders.get_by_id(order_id)
+        if order is None or order.status != 'pending':
+            return False
+        if payment_info.get('amount', order.total_amount) < order.total_amount:
+            return False
+        self._set_status(order_id, 'paid')
+        return True
+
+    async def fulfill_order(self, order_id: int) -> bool:
+        order = self.orders.get_by_id(order_id)
+        if order is None or order.status != 'paid':
+            return False
+        self._set_status(order_id, 'fulfilled')
+        return True
+
+    async def cancel_order(self, order_id: int, reason: str) -> bool:
+        order = self.orders.get_by_id(order_id)
+        if order is None or order.status in ('fulfilled', 'cancelled'):
+            return False
+
+        # Mark cancelled before awaiting so a concurrent cancel can't restock twice
+        self._set_status(order_id, 'cancelled')
+        await gather_bounded(
+            (self.product_service.update_inventory(item['product_id'], item['quantity'])
+             for item in order.items),
+            self.concurrency, self.timeout
+        )
+        logger.info("Order %s cancelled: %s", order_id, reason)
+        return True
+
+    async def get_order_status(self, order_id: int) -> Dict[str, Any]:
+        status = self.status_model.get(order_id)
+        if status is not None:
+            return status
+
+        # Evicted from the read model (or never seen): rebuild from the repository
+        order = self.orders.get_by_id(order_id)
+        if order is None:
+            return {'order_id': order_id, 'status': 'not_found'}
+        return order_status_event(order)
+
+    async def wait_for_order_status(self, order_id: int, since_version: int = 0,
+                                    timeout: Optional[float] = 30.0) -> Optional[Dict[str, Any]]:
+        """Long-poll get_order_status: wait until the status changes past since_version"""
+        try:
+            return await self.status_model.wait_for_change(order_id, since_version, timeout)
+        except KeyError:
+            # Not in the read model (evicted or unknown): answer from the repository
+            return await self.get_order_status(order_id)
+
+
+class InProcessUserService(AsyncUserServiceInterface):
+    """
+    User service whose get_user_orders calls the order service with a timeout
+    """
+
+    def __init__(self, order_service: InProcessOrderService,
+                 users: Optional[InMemoryRepository] = None, timeout: float = DEFAULT_TIMEOUT):
+        self.order_service = order_service
+        self.users = users or InMemoryRepository(User)
+        self.user_ids_by_username: Dict[str, int] = {}
+        self.timeout = timeout
+
+    async def authenticate_user(self, username: str, password: str) -> Optional[User]:
+        user = self.users.get_by_id(self.user_ids_by_username.get(username, 0))
+        if user is None or not user.is_active or not verify_password(password, user.password_hash):
+            return None
+        return user
+
+    async def create_user(self, user_data: Dict[str, Any]) -> User:
+        if not user_data.get('username') or not user_data.get('password'):
+            raise ValueError("username and password are required")
+        if user_data['username'] in self.user_ids_by_username:
+            raise ValueError("username already exists")
+
+        data = {key: value for key, value in user_data.items() if key != 'password'}
+        data['password_hash'] = hash_password(user_data['password'])
+        user = self.users.create(data)
+        self.user_ids_by_username[user.username] = user.id
+        return user
+
+    async def get_user_orders(self, user_id: int) -> List[Order]:
+        return await asyncio.wait_for(self.order_service.get_orders_for_user(user_id), self.timeout)
+
+    async def update_user_profile(self, user_id: int, profile_data: Dict[str, Any]) -> Optional[User]:
+        allowed = {key: value for key, value in profile_data.items() if key in ('email', 'is_active')}
+        return self.users.update(user_id, allowed)
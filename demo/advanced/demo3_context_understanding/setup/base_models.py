@@ -6,11 +6,43 @@ This file provides the architectural foundation that Copilot will understand
 and extend consistently across all services in the microservices demo.
 """
 
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import asyncio
+import inspect
+import json
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any
+from dataclasses import dataclass, field, fields, make_dataclass
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional fast JSON encoder
+    orjson = None
+
+
+_serializers: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
+
+def serializer_for(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Return a to_dict function generated once for a dataclass from its
+    field list: straight-line attribute reads instead of walking __dict__,
+    skipping None values like BaseModel.to_dict. Only declared fields
+    are emitted, so it also works for slotted models.
+    """
+    serializer = _serializers.get(cls)
+    if serializer is None:
+        lines = ["def to_dict(self):", "    data = {}"]
+        for f in fields(cls):
+            lines.append(f"    value = self.{f.name}")
+            lines.append(f"    if value is not None: data[{f.name!r}] = value")
+        lines.append("    return data")
+        namespace: Dict[str, Any] = {}
+        exec("\n".join(lines), namespace)
+        serializer = _serializers[cls] = namespace["to_dict"]
+    return serializer
+
 
 @dataclass
 class BaseModel:
@@ -63,6 +95,199 @@ class BaseService(ABC):
         return logging.getLogger(self.__class__.__name__)
 
 
+class BaseRepository(BaseService):
+    """
+    Concrete BaseService with batch operations and an identity map.
+
+    Subclasses only provide the four storage primitives below, each of
+    which handles many ids in one round trip. Within a unit of work,
+    repeated get_by_id/get_many calls for the same id are served from
+    the identity map instead of the database, and updates are applied
+    to the instances already handed out. Outside a unit of work there is
+    no identity map and every read goes to the database.
+    """
+
+    def __init__(self, db_connection: Any):
+        super().__init__(db_connection)
+        self.identity_map: Optional[Dict[int, BaseModel]] = None
+
+    @abstractmethod
+    def _fetch_many(self, ids: List[int]) -> Dict[int, BaseModel]:
+        """Load the entities that exist among ids"""
+        pass
+
+    @abstractmethod
+    def _insert_many(self, items: List[Dict[str, Any]]) -> List[BaseModel]:
+        """Insert entities and return them with ids assigned"""
+        pass
+
+    @abstractmethod
+    def _update_many(self, changes: Dict[int, Dict[str, Any]]) -> Dict[int, BaseModel]:
+        """Apply field changes and return the entities that exist"""
+        pass
+
+    @abstractmethod
+    def _delete_many(self, ids: List[int]) -> List[int]:
+        """Delete entities and return the ids that existed"""
+        pass
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator["BaseRepository"]:
+        """
+        Scope an identity map to a block, e.g. one request. A nested unit
+        of work shares the enclosing one's map, which is restored on exit.
+        """
+        outer = self.identity_map
+        if outer is None:
+            self.identity_map = {}
+        try:
+            yield self
+        finally:
+            self.identity_map = outer
+
+    def get_many(self, ids: Iterable[int]) -> Dict[int, BaseModel]:
+        ids = list(dict.fromkeys(ids))
+        identity_map = self.identity_map
+        if identity_map is None:
+            found = self._fetch_many(ids)
+            return {id: found[id] for id in ids if id in found}
+
+        missing = [id for id in ids if id not in identity_map]
+        if missing:
+            identity_map.update(self._fetch_many(missing))
+        return {id: identity_map[id] for id in ids if id in identity_map}
+
+    def create_many(self, items: List[Dict[str, Any]]) -> List[BaseModel]:
+        created = self._insert_many(items)
+        if self.identity_map is not None:
+            for entity in created:
+                self.identity_map[entity.id] = entity
+        return created
+
+    def update_many(self, changes: Dict[int, Dict[str, Any]]) -> Dict[int, BaseModel]:
+        updated = self._update_many(changes)
+        identity_map = self.identity_map
+        if identity_map is not None:
+            for id, entity in updated.items():
+                current = identity_map.get(id)
+                if current is None:
+                    identity_map[id] = entity
+                else:
+                    # Keep the instance callers already hold up to date
+                    for f in fields(entity):
+                        setattr(current, f.name, getattr(entity, f.name))
+                    updated[id] = current
+        return updated
+
+    def delete_many(self, ids: Iterable[int]) -> List[int]:
+        deleted = self._delete_many(list(ids))
+        if self.identity_map is not None:
+            for id in deleted:
+                self.identity_map.pop(id, None)
+        return deleted
+
+    def create(self, data: Dict[str, Any]) -> BaseModel:
+        return self.create_many([data])[0]
+
+    def get_by_id(self, id: int) -> Optional[BaseModel]:
+        return self.get_many([id]).get(id)
+
+    def update(self, id: int, data: Dict[str, Any]) -> Optional[BaseModel]:
+        return self.update_many({id: data}).get(id)
+
+    def delete(self, id: int) -> bool:
+        return bool(self.delete_many([id]))
+
+
+class InMemoryRepository(BaseRepository):
+    """
+    BaseRepository over a dict of rows, useful for tests and demos.
+    round_trips counts storage calls so batching is easy to observe.
+    """
+
+    def __init__(self, model_class: type, db_connection: Any = None):
+        super().__init__(db_connection)
+        self.model_class = model_class
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.next_id = 1
+        self.round_trips = 0
+
+    def _to_model(self, row: Dict[str, Any]) -> BaseModel:
+        return self.model_class(**row)
+
+    def _fetch_many(self, ids: List[int]) -> Dict[int, BaseModel]:
+        self.round_trips += 1
+        return {id: self._to_model(self.rows[id]) for id in ids if id in self.rows}
+
+    def _insert_many(self, items: List[Dict[str, Any]]) -> List[BaseModel]:
+        self.round_trips += 1
+        now = datetime.now()
+        created = []
+        for data in items:
+            row = dict(data, id=self.next_id, created_at=now, updated_at=now)
+            self.next_id += 1
+            self.rows[row['id']] = row
+            created.append(self._to_model(row))
+        return created
+
+    def _update_many(self, changes: Dict[int, Dict[str, Any]]) -> Dict[int, BaseModel]:
+        self.round_trips += 1
+        now = datetime.now()
+        updated = {}
+        for id, data in changes.items():
+            if id in self.rows:
+                self.rows[id].update(data, updated_at=now)
+                updated[id] = self._to_model(self.rows[id])
+        return updated
+
+    def _delete_many(self, ids: List[int]) -> List[int]:
+        self.round_trips += 1
+        return [id for id in ids if self.rows.pop(id, None) is not None]
+
+
+class DataLoader:
+    """
+    Coalesces load(key) calls made in the same event-loop tick into one
+    batch_fn(keys) call. batch_fn may be sync (e.g. repository.get_many)
+    or async, and returns a mapping of the keys it found.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], Any]):
+        self.batch_fn = batch_fn
+        self._pending: Dict[Any, "asyncio.Future[Any]"] = {}
+
+    def load(self, key: Any) -> "asyncio.Future[Any]":
+        """Future resolving to the value for key, or None if missing"""
+        if key in self._pending:
+            return self._pending[key]
+
+        loop = asyncio.get_running_loop()
+        if not self._pending:
+            loop.call_soon(lambda: asyncio.ensure_future(self._dispatch()))
+        future = loop.create_future()
+        self._pending[key] = future
+        return future
+
+    async def load_many(self, keys: Iterable[Any]) -> List[Any]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    async def _dispatch(self) -> None:
+        batch, self._pending = self._pending, {}
+        try:
+            results = self.batch_fn(list(batch))
+            if inspect.isawaitable(results):
+                results = await results
+        except Exception as error:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
+
+
 # Domain Models
 @dataclass
 class User(BaseModel):
@@ -105,8 +330,75 @@ class Order(BaseModel):
             self.items = []
 
 
+def _slotted_to_dict(self) -> Dict[str, Any]:
+    """Convert model to dictionary (declared fields; there is no __dict__)"""
+    return serializer_for(type(self))(self)
+
+
+def slotted_variant(cls: type) -> type:
+    """
+    Build a __slots__ dataclass with the same fields and methods as cls.
+    Instances have no per-object __dict__, which makes them smaller and
+    faster to create; to_dict uses the compiled serializer.
+    """
+    namespace = {
+        name: value for name, value in vars(cls).items()
+        if (callable(value) and not name.startswith('__')) or name == '__post_init__'
+    }
+    namespace['to_dict'] = _slotted_to_dict
+    spec = [(f.name, f.type, field(default=f.default, default_factory=f.default_factory))
+            for f in fields(cls)]
+    plain = make_dataclass(f"Slotted{cls.__name__}", spec, namespace=namespace)
+
+    # Recreate the class with __slots__ by hand, as dataclass(slots=True)
+    # does on Python 3.10+, so this still runs on 3.8 and 3.9
+    names = tuple(f.name for f in fields(plain))
+    body = {key: value for key, value in vars(plain).items()
+            if key not in names and key not in ('__dict__', '__weakref__')}
+    body['__slots__'] = names
+    return type(plain)(plain.__name__, plain.__bases__, body)
+
+
+SlottedUser = slotted_variant(User)
+SlottedProduct = slotted_variant(Product)
+SlottedOrder = slotted_variant(Order)
+
+
+def to_records(models: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Serialize a list of models with the compiled serializers, looking up
+    each class's serializer once (declared fields only)
+    """
+    records = []
+    serializer = None
+    serializer_cls = None
+    for model in models:
+        if type(model) is not serializer_cls:
+            serializer_cls = type(model)
+            serializer = serializer_for(serializer_cls)
+        records.append(serializer(model))
+    return records
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def to_json_bytes(models: Any) -> bytes:
+    """Encode a model or list of models straight to JSON bytes (uses orjson if installed)"""
+    if isinstance(models, (list, tuple)):
+        payload = to_records(models)
+    else:
+        payload = serializer_for(type(models))(models)
+    if orjson is not None:
+        return orjson.dumps(payload, default=_json_default)
+    return json.dumps(payload, separators=(',', ':'), default=_json_default).encode()
+
+
 if __name__ == "__main__":
     print("🏗️  Foundation models ready for Copilot context understanding demo!")
     print("📋 Available models: User, Product, Order")
-    print("🔧 Available patterns: BaseModel, BaseService")
+    print("🔧 Available patterns: BaseModel, BaseService, BaseRepository, DataLoader")
     print("\n🚀 Ask Copilot to create services using these patterns!")
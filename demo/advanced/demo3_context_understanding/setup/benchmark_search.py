@@ -0,0 +1,68 @@
+"""
+Demo 3: Product Search Benchmark
+===============================
+
+Builds the search engine over synthetic products (1M by default) and
+reports average latency for text, facet, price and combined queries.
+"""
+
+import random
+import sys
+import time
+
+from base_models import Product
+from search import ProductSearchEngine
+
+PRODUCT_COUNT = 1_000_000
+QUERY_REPEATS = 20
+
+ADJECTIVES = ["red", "blue", "green", "vintage", "modern", "compact", "deluxe", "organic"]
+NOUNS = ["chair", "lamp", "table", "shirt", "kettle", "speaker", "backpack", "watch"]
+
+
+def make_products(count):
+    rng = random.Random(7)
+    for i in range(1, count + 1):
+        yield Product(
+            id=i,
+            name=f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}",
+            description=f"{rng.choice(ADJECTIVES)} {rng.choice(ADJECTIVES)} design",
+            price=round(rng.uniform(1, 500), 2),
+            category_id=rng.randint(1, 200),
+            stock_quantity=rng.randint(0, 100)
+        )
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    for _ in range(QUERY_REPEATS):
+        results = fn()
+    elapsed = (time.perf_counter() - start) / QUERY_REPEATS
+    print(f"  {label:<40} {elapsed * 1000:>8.2f} ms  ({len(results):,} hits)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else PRODUCT_COUNT
+    engine = ProductSearchEngine()
+    start = time.perf_counter()
+    engine.load(make_products(count))
+    print(f"Indexed {count:,} products in {time.perf_counter() - start:.1f}s")
+
+    timed("text: 'lamp'", lambda: engine.search("lamp"))
+    timed("text: 'vintage lamp'", lambda: engine.search("vintage lamp"))
+    timed("category_id=42", lambda: engine.search(category_id=42))
+    timed("price 100-101", lambda: engine.search(min_price=100, max_price=101))
+    timed("'vintage lamp' + category 42", lambda: engine.search("vintage lamp", category_id=42))
+    timed("'lamp' + category 42 + price 0-250",
+          lambda: engine.search("lamp", category_id=42, min_price=0, max_price=250))
+    timed("facet counts for 'vintage lamp'", lambda: engine.facet_counts("vintage lamp"))
+
+    product = Product(id=count + 1, name="new lamp", price=99.0, category_id=42)
+    start = time.perf_counter()
+    engine.add(product)
+    engine.remove(product.id)
+    print(f"Incremental add + remove: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
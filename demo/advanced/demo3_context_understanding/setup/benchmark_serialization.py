@@ -0,0 +1,48 @@
+"""
+Demo 3: Serialization Benchmark
+==============================
+
+Compares the __dict__-walking BaseModel.to_dict with the compiled
+per-class serializers, slotted variants and direct JSON encoding.
+"""
+
+import json
+import sys
+import time
+from datetime import datetime
+
+from base_models import (Order, SlottedOrder, SlottedUser, User, to_json_bytes,
+                         to_records)
+
+MODEL_COUNT = 100_000
+
+
+def timed(label, fn, count):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<32} {count / elapsed:>12,.0f} models/s")
+
+
+def run(name, user_cls, order_cls, count):
+    now = datetime.now()
+    models = []
+    for i in range(count // 2):
+        models.append(user_cls(id=i, created_at=now, username=f"user{i}", email=f"user{i}@example.com"))
+        models.append(order_cls(id=i, created_at=now, user_id=i, total_amount=9.99, items=[]))
+
+    print(f"{name}:")
+    timed("to_dict", lambda: [m.to_dict() for m in models], count)
+    timed("to_records", lambda: to_records(models), count)
+    timed("to_records + json.dumps", lambda: json.dumps(to_records(models), default=str), count)
+    timed("to_json_bytes", lambda: to_json_bytes(models), count)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else MODEL_COUNT
+    run("Dataclass models", User, Order, count)
+    run("Slotted models", SlottedUser, SlottedOrder, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Demo 3: Sharded Inventory Engine
+===============================
+
+Reference inventory engine for ProductServiceInterface.reserve_items
+and update_inventory. Stock counters are spread across lock shards by
+product_id, so unrelated products never contend on one global lock.
+"""
+
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _Shard:
+    __slots__ = ("lock", "stock", "reservations")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stock: Dict[int, int] = {}
+        self.reservations: Dict[int, Tuple[float, Dict[int, int]]] = {}
+
+
+class ShardedInventory:
+    """
+    Stock counters sharded by product_id.
+
+    reserve_items takes the locks of every shard in the basket in sorted
+    shard order (so two baskets can never deadlock), checks every line,
+    and only then decrements. Each reservation carries a TTL; commit()
+    makes it permanent, release() returns the stock, and the background
+    reaper releases reservations that were never committed. Reservations
+    are kept in the shard their id hashes to, so bookkeeping for
+    different baskets does not share a lock either.
+    """
+
+    def __init__(self, shards: int = 64, reservation_ttl: float = 900.0):
+        self.shards = [_Shard() for _ in range(shards)]
+        self.reservation_ttl = reservation_ttl
+        self._reservation_ids = itertools.count(1)
+        self._reaper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _shard(self, product_id: int) -> _Shard:
+        return self.shards[hash(product_id) % len(self.shards)]
+
+    def set_stock(self, product_id: int, quantity: int) -> None:
+        shard = self._shard(product_id)
+        with shard.lock:
+            shard.stock[product_id] = quantity
+
+    def get_stock(self, product_id: int) -> int:
+        return self._shard(product_id).stock.get(product_id, 0)
+
+    def check_availability(self, product_id: int, quantity: int) -> bool:
+        return self.get_stock(product_id) >= quantity
+
+    def update_inventory(self, product_id: int, quantity_change: int) -> bool:
+        shard = self._shard(product_id)
+        with shard.lock:
+            current = shard.stock.get(product_id, 0)
+            if current + quantity_change < 0:
+                return False
+            shard.stock[product_id] = current + quantity_change
+            return True
+
+    def _apply(self, quantities: Dict[int, int], sign: int) -> bool:
+        """Check and apply sign * quantity to every product atomically"""
+        shard_ids = sorted({hash(product_id) % len(self.shards) for product_id in quantities})
+        for shard_id in shard_ids:
+            self.shards[shard_id].lock.acquire()
+        try:
+            if sign < 0:
+                for product_id, quantity in quantities.items():
+                    if self._shard(product_id).stock.get(product_id, 0) < quantity:
+                        return False
+            for product_id, quantity in quantities.items():
+                stock = self._shard(product_id).stock
+                stock[product_id] = stock.get(product_id, 0) + sign * quantity
+            return True
+        finally:
+            for shard_id in reversed(shard_ids):
+                self.shards[shard_id].lock.release()
+
+    def reserve_items(self, items: List[Dict[str, Any]], ttl: Optional[float] = None) -> Optional[int]:
+        """Reserve a whole basket or nothing; returns a reservation id or None"""
+        quantities: Dict[int, int] = {}
+        for item in items:
+            if item['quantity'] <= 0:
+                raise ValueError("Quantities must be positive")
+            quantities[item['product_id']] = quantities.get(item['product_id'], 0) + item['quantity']
+
+        if not self._apply(quantities, -1):
+            return None
+
+        expires_at = time.monotonic() + (self.reservation_ttl if ttl is None else ttl)
+        reservation_id = next(self._reservation_ids)
+        shard = self._shard(reservation_id)
+        with shard.lock:
+            shard.reservations[reservation_id] = (expires_at, quantities)
+        return reservation_id
+
+    def _pop_reservation(self, reservation_id: int) -> Optional[Tuple[float, Dict[int, int]]]:
+        shard = self._shard(reservation_id)
+        with shard.lock:
+            return shard.reservations.pop(reservation_id, None)
+
+    def commit(self, reservation_id: int) -> bool:
+        """Keep the reserved stock deducted (e.g. once payment succeeds)"""
+        return self._pop_reservation(reservation_id) is not None
+
+    def release(self, reservation_id: int) -> bool:
+        """Return reserved stock to the shelves"""
+        reservation = self._pop_reservation(reservation_id)
+        if reservation is None:
+            return False
+        self._apply(reservation[1], 1)
+        return True
+
+    def reap_expired(self) -> int:
+        """Release every reservation whose TTL has passed"""
+        now = time.monotonic()
+        expired = []
+        for shard in self.shards:
+            with shard.lock:
+                expired.extend(reservation_id for reservation_id, (expires_at, _)
+                               in shard.reservations.items() if expires_at <= now)
+        return sum(self.release(reservation_id) for reservation_id in expired)
+
+    def start_reaper(self, interval: float = 1.0) -> None:
+        """Reap expired reservations every interval seconds in a daemon thread"""
+        if self._reaper is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                self.reap_expired()
+
+        self._reaper = threading.Thread(target=run, name="inventory-reaper", daemon=True)
+        self._reaper.start()
+
+    def stop_reaper(self) -> None:
+        if self._reaper is not None:
+            self._stop.set()
+            self._reaper.join()
+            self._reaper = None
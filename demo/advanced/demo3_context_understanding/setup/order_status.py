@@ -0,0 +1,126 @@
+"""
+Demo 3: Order Status Read Model
+==============================
+
+Materialized view behind OrderServiceInterface.get_order_status. The
+order service publishes a snapshot event whenever an order changes;
+the read model stores the latest one per order, so polls are a dict
+lookup, and clients can long-poll or subscribe instead of polling.
+"""
+
+import asyncio
+import itertools
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from base_models import Order
+
+TERMINAL_STATUSES = ("fulfilled", "cancelled")
+
+
+def order_status_event(order: Order) -> Dict[str, Any]:
+    """Snapshot of an order as published on the event stream"""
+    return {
+        'order_id': order.id,
+        'status': order.status,
+        'total_amount': order.total_amount,
+        'items': order.items,
+        'updated_at': order.updated_at
+    }
+
+
+class OrderEventStream:
+    """
+    In-process publish/subscribe channel for order change events
+    """
+
+    def __init__(self):
+        self._subscribers: List[Callable[[Dict[str, Any]], None]] = []
+
+    def subscribe(self, handler: Callable[[Dict[str, Any]], None]) -> None:
+        self._subscribers.append(handler)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        for handler in self._subscribers:
+            handler(event)
+
+
+class OrderStatusReadModel:
+    """
+    Latest status per order, fed by an OrderEventStream.
+
+    Each update gets a version from a global sequence. Memory stays
+    bounded: at most max_orders statuses are kept (least recently
+    updated evicted first), and waiters are dropped once woken or timed
+    out. Waiting on an order that is not held (never seen, or evicted)
+    raises KeyError, as does eviction while waiting; callers fall back to
+    the repository.
+    """
+
+    def __init__(self, events: OrderEventStream, max_orders: int = 100_000):
+        self.max_orders = max_orders
+        self.statuses: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._versions = itertools.count(1)
+        self._waiters: Dict[int, List["asyncio.Future[Dict[str, Any]]"]] = {}
+        events.subscribe(self.apply)
+
+    def apply(self, event: Dict[str, Any]) -> None:
+        order_id = event['order_id']
+        status = dict(event, version=next(self._versions))
+        self.statuses.pop(order_id, None)
+        self.statuses[order_id] = status
+        while len(self.statuses) > self.max_orders:
+            evicted_id, _ = self.statuses.popitem(last=False)
+            for waiter in self._waiters.pop(evicted_id, []):
+                if not waiter.done():
+                    waiter.set_exception(KeyError(evicted_id))
+
+        for waiter in self._waiters.pop(order_id, []):
+            if not waiter.done():
+                waiter.set_result(status)
+
+    def get(self, order_id: int) -> Optional[Dict[str, Any]]:
+        return self.statuses.get(order_id)
+
+    async def wait_for_change(self, order_id: int, since_version: int = 0,
+                              timeout: Optional[float] = 30.0) -> Optional[Dict[str, Any]]:
+        """
+        Long poll: return the status as soon as its version is newer than
+        since_version, or the current status once timeout expires.
+        Raises KeyError if the order is not (or no longer) held.
+        """
+        current = self.statuses.get(order_id)
+        if current is None:
+            raise KeyError(order_id)
+        if current['version'] > since_version:
+            return current
+
+        waiter = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.setdefault(order_id, [])
+        waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            return self.statuses.get(order_id, current)
+        finally:
+            waiters = self._waiters.get(order_id)
+            if waiters is not None and waiter in waiters:
+                waiters.remove(waiter)
+                if not waiters:
+                    del self._waiters[order_id]
+
+    async def subscribe(self, order_id: int, since_version: int = 0,
+                        timeout: Optional[float] = 300.0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield each new status for an order until it reaches a terminal
+        state, or until no change arrives for timeout seconds. Raises
+        KeyError if the order is not (or no longer) held.
+        """
+        while True:
+            status = await self.wait_for_change(order_id, since_version, timeout)
+            if status['version'] <= since_version:
+                return  # timed out without a change
+            yield status
+            if status['status'] in TERMINAL_STATUSES:
+                return
+            since_version = status['version']
@@ -0,0 +1,155 @@
+"""
+Demo 3: Faceted Product Search
+=============================
+
+In-memory search engine behind ProductServiceInterface.search_products
+and get_products_by_category: an inverted token index on name and
+description, a category facet and a sorted price index, all updated
+incrementally as products change.
+"""
+
+import bisect
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from base_models import Product
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> Set[str]:
+    return set(TOKEN_PATTERN.findall(text.lower()))
+
+
+class ProductSearchEngine:
+    """
+    Each filter (every query token, the category, the price range) maps
+    to a posting set of product ids. search() starts from the smallest
+    one and checks the remaining filters per candidate, so combined
+    filters cost about the size of the most selective one.
+    """
+
+    def __init__(self):
+        self.tokens: Dict[str, Set[int]] = {}
+        self.categories: Dict[int, Set[int]] = {}
+        self.prices: List[Tuple[float, int]] = []
+        self._indexed: Dict[int, Tuple[Set[str], int, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._indexed)
+
+    def add(self, product: Product) -> None:
+        if product.id in self._indexed:
+            self.remove(product.id)
+
+        tokens = tokenize(f"{product.name} {product.description}")
+        for token in tokens:
+            self.tokens.setdefault(token, set()).add(product.id)
+        self.categories.setdefault(product.category_id, set()).add(product.id)
+        bisect.insort(self.prices, (product.price, product.id))
+        self._indexed[product.id] = (tokens, product.category_id, product.price)
+
+    def load(self, products: Iterable[Product]) -> None:
+        """Index many products at once, sorting the price index a single time"""
+        latest = {product.id: product for product in products}
+        # Drop re-indexed products first: remove() bisects self.prices,
+        # which is only sorted again once the new entries are in
+        for product_id in latest:
+            if product_id in self._indexed:
+                self.remove(product_id)
+        for product in latest.values():
+            tokens = tokenize(f"{product.name} {product.description}")
+            for token in tokens:
+                self.tokens.setdefault(token, set()).add(product.id)
+            self.categories.setdefault(product.category_id, set()).add(product.id)
+            self.prices.append((product.price, product.id))
+            self._indexed[product.id] = (tokens, product.category_id, product.price)
+        self.prices.sort()
+
+    def remove(self, product_id: int) -> bool:
+        entry = self._indexed.pop(product_id, None)
+        if entry is None:
+            return False
+
+        tokens, category_id, price = entry
+        for token in tokens:
+            postings = self.tokens[token]
+            postings.discard(product_id)
+            if not postings:
+                del self.tokens[token]
+        members = self.categories[category_id]
+        members.discard(product_id)
+        if not members:
+            del self.categories[category_id]
+        del self.prices[bisect.bisect_left(self.prices, (price, product_id))]
+        return True
+
+    def update(self, product: Product) -> None:
+        self.add(product)
+
+    def _price_slice(self, min_price: Optional[float], max_price: Optional[float]) -> Tuple[int, int]:
+        start = 0 if min_price is None else bisect.bisect_left(self.prices, (min_price,))
+        end = (len(self.prices) if max_price is None
+               else bisect.bisect_left(self.prices, (max_price, float('inf'))))
+        return start, max(start, end)
+
+    def search(self, query: str = "", category_id: Optional[int] = None,
+               min_price: Optional[float] = None, max_price: Optional[float] = None,
+               limit: Optional[int] = None) -> List[int]:
+        """Ids of products matching every query token and filter, in id order"""
+        # None stands for the price range, materialized only if it is smallest
+        sources: List[Optional[Iterable[int]]] = []
+        sizes: List[int] = []
+        for token in tokenize(query):
+            postings = self.tokens.get(token)
+            if not postings:
+                return []
+            sources.append(postings)
+            sizes.append(len(postings))
+        if category_id is not None:
+            members = self.categories.get(category_id)
+            if not members:
+                return []
+            sources.append(members)
+            sizes.append(len(members))
+
+        price_filtered = min_price is not None or max_price is not None
+        start, end = self._price_slice(min_price, max_price)
+        if price_filtered:
+            sources.append(None)
+            sizes.append(end - start)
+        if not sources:
+            sources.append(self._indexed)
+            sizes.append(len(self._indexed))
+
+        smallest = min(range(len(sources)), key=sizes.__getitem__)
+        others = [source for i, source in enumerate(sources)
+                  if i != smallest and isinstance(source, set)]
+
+        candidates = sources[smallest]
+        if candidates is None:
+            candidates = [product_id for _, product_id in self.prices[start:end]]
+
+        results = []
+        for product_id in candidates:
+            if any(product_id not in other for other in others):
+                continue
+            if price_filtered:
+                price = self._indexed[product_id][2]
+                if ((min_price is not None and price < min_price)
+                        or (max_price is not None and price > max_price)):
+                    continue
+            results.append(product_id)
+
+        results.sort()
+        return results if limit is None else results[:limit]
+
+    def get_by_category(self, category_id: int) -> List[int]:
+        return sorted(self.categories.get(category_id, ()))
+
+    def facet_counts(self, query: str = "", min_price: Optional[float] = None,
+                     max_price: Optional[float] = None) -> Dict[int, int]:
+        """Matching product count per category_id for the other filters"""
+        matches = set(self.search(query, min_price=min_price, max_price=max_price))
+        return {category_id: len(members & matches)
+                for category_id, members in self.categories.items() if members & matches}
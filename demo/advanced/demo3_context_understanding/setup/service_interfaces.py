@@ -101,6 +101,96 @@ class OrderServiceInterface(ABC):
         pass
 
 
+class AsyncUserServiceInterface(ABC):
+    """
+    asyncio counterpart of UserServiceInterface, so cross-service calls
+    such as get_user_orders don't block the caller
+    """
+
+    @abstractmethod
+    async def authenticate_user(self, username: str, password: str) -> Optional[User]:
+        """Authenticate user and return user object if successful"""
+        pass
+
+    @abstractmethod
+    async def create_user(self, user_data: Dict[str, Any]) -> User:
+        """Create a new user with validation"""
+        pass
+
+    @abstractmethod
+    async def get_user_orders(self, user_id: int) -> List[Order]:
+        """Get all orders for a specific user - requires cross-service communication"""
+        pass
+
+    @abstractmethod
+    async def update_user_profile(self, user_id: int, profile_data: Dict[str, Any]) -> Optional[User]:
+        """Update user profile information"""
+        pass
+
+
+class AsyncProductServiceInterface(ABC):
+    """
+    asyncio counterpart of ProductServiceInterface
+    """
+
+    @abstractmethod
+    async def check_availability(self, product_id: int, quantity: int) -> bool:
+        """Check if requested quantity is available"""
+        pass
+
+    @abstractmethod
+    async def reserve_items(self, items: List[Dict[str, Any]]) -> bool:
+        """Reserve items for order processing"""
+        pass
+
+    @abstractmethod
+    async def update_inventory(self, product_id: int, quantity_change: int) -> bool:
+        """Update inventory levels (positive or negative change)"""
+        pass
+
+    @abstractmethod
+    async def get_products_by_category(self, category_id: int) -> List[Product]:
+        """Get all products in a specific category"""
+        pass
+
+    @abstractmethod
+    async def search_products(self, query: str, filters: Dict[str, Any]) -> List[Product]:
+        """Search products with filtering capabilities"""
+        pass
+
+
+class AsyncOrderServiceInterface(ABC):
+    """
+    asyncio counterpart of OrderServiceInterface; implementations can fan
+    out to the product service concurrently
+    """
+
+    @abstractmethod
+    async def create_order(self, user_id: int, items: List[Dict[str, Any]]) -> Order:
+        """Create order with validation and inventory checking"""
+        pass
+
+    @abstractmethod
+    async def process_payment(self, order_id: int, payment_info: Dict[str, Any]) -> bool:
+        """Process payment for an order"""
+        pass
+
+    @abstractmethod
+    async def fulfill_order(self, order_id: int) -> bool:
+        """Mark order as fulfilled and update inventory"""
+        pass
+
+    @abstractmethod
+    async def cancel_order(self, order_id: int, reason: str) -> bool:
+        """Cancel order and return inventory to stock"""
+        pass
+
+    @abstractmethod
+    async def get_order_status(self, order_id: int) -> Dict[str, Any]:
+        """Get detailed order status and tracking information"""
+        pass
+
+
 # Configuration for expected project structure
 EXPECTED_PROJECT_STRUCTURE = """
 microservices_demo/
@@ -142,6 +232,7 @@ if __name__ == "__main__":
     print("   - UserServiceInterface")
     print("   - ProductServiceInterface")
     print("   - OrderServiceInterface")
+    print("   - Async*ServiceInterface counterparts (see async_services.py)")
     print("\n🚀 Ask Copilot to implement these interfaces following the BaseService pattern!")
     print("\nExpected project structure:")
     print(EXPECTED_PROJECT_STRUCTURE)
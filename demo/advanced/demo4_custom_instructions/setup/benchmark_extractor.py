@@ -0,0 +1,80 @@
+"""
+Demo 4: Ticket Extractor Benchmark
+=================================
+
+Measures parse throughput of the streaming extractor over a corpus of
+saved pages. Pass a directory of .html files to use real pages;
+otherwise a synthetic corpus is generated in a temporary directory.
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from extractor import iter_tickets
+
+PAGE_COUNT = 200
+TICKETS_PER_PAGE = 100
+CHUNK_SIZE = 64 * 1024
+
+VENUES = ["Madison Square Garden", "O2 Arena", "Red Rocks", "Royal Albert Hall", "Wembley"]
+
+
+def synthetic_page(rng, page):
+    tickets = []
+    for i in range(TICKETS_PER_PAGE):
+        tickets.append(
+            f'<div class="ticket card">\n'
+            f'  <h2 class="event-name">Concert {page}-{i} &amp; Friends</h2>\n'
+            f'  <p class="venue">{rng.choice(VENUES)}<br>Doors 7pm\n'
+            f'  <span class="price">${rng.randint(20, 2000):,}.{rng.randint(0, 99):02d}</span>\n'
+            f'  <img src="/img/{i}.png" alt="">\n'
+            f'  <a class="buy" href="/events/{page}/{i}">Buy</a>\n'
+            f'</div>\n'
+        )
+    return ("<html><head><title>Listings</title></head><body><nav>...</nav>\n"
+            + "".join(tickets) + "<footer>...</footer></body></html>")
+
+
+def build_corpus(directory):
+    rng = random.Random(42)
+    for page in range(PAGE_COUNT):
+        (directory / f"page_{page:04d}.html").write_text(synthetic_page(rng, page), encoding="utf-8")
+
+
+def chunks(text, size):
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def run(pages, chunk_size):
+    total = 0
+    start = time.perf_counter()
+    for page in pages:
+        total += sum(1 for _ in iter_tickets(chunks(page, chunk_size), "https://tickets.example.com/"))
+    return total, time.perf_counter() - start
+
+
+def main():
+    if len(sys.argv) > 1:
+        corpus = Path(sys.argv[1])
+        pages = [path.read_text(encoding="utf-8") for path in sorted(corpus.glob("*.html"))]
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            build_corpus(Path(tmp))
+            pages = [path.read_text(encoding="utf-8") for path in sorted(Path(tmp).glob("*.html"))]
+
+    size_mb = sum(len(page.encode()) for page in pages) / 1e6
+    print(f"Corpus: {len(pages)} pages, {size_mb:.1f} MB\n")
+
+    for label, chunk_size in (("whole page", max(len(page) for page in pages)),
+                              ("64 KB chunks", CHUNK_SIZE), ("4 KB chunks", 4096)):
+        tickets, elapsed = run(pages, chunk_size)
+        print(f"{label:<14} {elapsed:6.2f} s  {size_mb / elapsed:6.1f} MB/s  "
+              f"{tickets / elapsed:9.0f} tickets/s  ({tickets} tickets)")
+
+
+if __name__ == "__main__":
+    main()
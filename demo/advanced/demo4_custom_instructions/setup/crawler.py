@@ -0,0 +1,201 @@
+"""
+Demo 4: Concurrent Crawl Engine
+==============================
+
+Thread-pool fetcher for the ticket scraper with per-host token-bucket
+rate limiting, connection reuse, conditional requests and jittered
+retries.
+"""
+
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+import queue
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching one URL"""
+    url: str
+    status: Optional[int]
+    text: Optional[str]
+    from_cache: bool = False
+    attempts: int = 1
+    error: Optional[str] = None
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, bursting up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CrawlEngine:
+    """
+    Fetches many URLs concurrently while staying polite to each host.
+
+    - one token bucket per host caps its request rate
+    - sessions are checked out of a pool, so keep-alive connections are
+      reused across requests and crawls without sharing one between threads
+    - ETag/Last-Modified from earlier responses are sent back, and a 304
+      is answered from the cached body (only the max_cached_pages most
+      recently used bodies are kept)
+    - timeouts, connection errors and 429/5xx responses are retried with
+      exponential backoff plus jitter (honouring Retry-After seconds, up
+      to max_retry_after)
+    """
+
+    def __init__(self, max_workers: int = 16, per_host_rate: float = 5.0,
+                 per_host_burst: float = 5.0, timeout: float = 10.0,
+                 max_retries: int = 3, backoff: float = 0.5,
+                 max_retry_after: float = 30.0, max_cached_pages: int = 1024,
+                 user_agent: str = "TicketScraper/1.0"):
+        self.max_workers = max_workers
+        self.per_host_rate = per_host_rate
+        self.per_host_burst = per_host_burst
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_retry_after = max_retry_after
+        self.max_cached_pages = max_cached_pages
+        self.user_agent = user_agent
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+        # url -> (ETag, Last-Modified, body), least recently used first
+        self._validators: "OrderedDict[str, Tuple[Optional[str], Optional[str], str]]" = OrderedDict()
+        self._validators_lock = threading.Lock()
+        self._sessions: "queue.LifoQueue[requests.Session]" = queue.LifoQueue()
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        with self._buckets_lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.per_host_rate, self.per_host_burst)
+            return bucket
+
+    def _checkout_session(self) -> requests.Session:
+        try:
+            return self._sessions.get_nowait()
+        except queue.Empty:
+            session = requests.Session()
+            session.headers["User-Agent"] = self.user_agent
+            adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=1)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            return session
+
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_retry_after)
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    def fetch(self, url: str) -> FetchResult:
+        """Fetch one URL with rate limiting, revalidation and retries"""
+        headers = {}
+        with self._validators_lock:
+            cached = self._validators.get(url)
+            if cached is not None:
+                self._validators.move_to_end(url)
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        bucket = self._bucket(url)
+        error = None
+        response: Optional[requests.Response] = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self._retry_delay(attempt - 1, response))
+            response = None
+            bucket.acquire()
+            session = self._checkout_session()
+            try:
+                response = session.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as exc:
+                error = str(exc)
+                continue
+            finally:
+                self._sessions.put(session)
+
+            if response.status_code == 304 and cached is not None:
+                return FetchResult(url, 304, cached[2], from_cache=True, attempts=attempt + 1)
+            if response.status_code in RETRY_STATUSES:
+                error = f"HTTP {response.status_code}"
+                continue
+
+            if response.status_code == 200:
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    self._remember(url, (etag, last_modified, response.text))
+            return FetchResult(url, response.status_code, response.text, attempts=attempt + 1)
+
+        status = response.status_code if response is not None else None
+        return FetchResult(url, status, None, attempts=self.max_retries + 1, error=error)
+
+    def _remember(self, url: str, entry: Tuple[Optional[str], Optional[str], str]) -> None:
+        with self._validators_lock:
+            self._validators[url] = entry
+            self._validators.move_to_end(url)
+            while len(self._validators) > self.max_cached_pages:
+                self._validators.popitem(last=False)
+
+    def stream(self, url: str, chunk_size: int = 64 * 1024) -> Iterator[str]:
+        """Yield the decoded body in chunks as it arrives (rate limited, not retried or cached)"""
+        self._bucket(url).acquire()
+        session = self._checkout_session()
+        try:
+            with session.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                if response.encoding is None:
+                    response.encoding = "utf-8"
+                yield from response.iter_content(chunk_size, decode_unicode=True)
+        finally:
+            self._sessions.put(session)
+
+    def crawl(self, urls: Iterable[str]) -> Iterator[FetchResult]:
+        """Fetch URLs concurrently, yielding results as they complete"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.fetch, url) for url in urls]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._sessions.get_nowait().close()
+            except queue.Empty:
+                return
@@ -0,0 +1,231 @@
+"""
+Demo 4: Streaming Ticket Extractor
+=================================
+
+Incremental HTML parser that turns ticket listing pages into TicketInfo
+records as chunks arrive, without building a DOM. Each site gets a set
+of simple selectors ("tag.class", optionally "@attr") compiled once.
+"""
+
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+import re
+
+
+@dataclass
+class TicketInfo:
+    """Basic ticket information - will be enhanced with custom instructions"""
+    event_name: str
+    venue: str
+    price: float
+    url: str
+
+
+PRICE_PATTERN = re.compile(r"\d[\d,]*(?:\.\d+)?")
+VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "source", "track", "wbr",
+})
+# Start tags that implicitly close an open <p>, and the elements it can't
+# be closed across (the HTML "button scope")
+CLOSES_P = frozenset({
+    "address", "article", "aside", "blockquote", "details", "div", "dl",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3",
+    "h4", "h5", "h6", "header", "hgroup", "hr", "main", "menu", "nav", "ol",
+    "p", "pre", "section", "table", "ul",
+})
+P_SCOPE = frozenset({
+    "applet", "button", "caption", "html", "marquee", "object", "table",
+    "td", "template", "th",
+})
+
+
+@dataclass(frozen=True)
+class Selector:
+    """Compiled form of "tag.class1.class2@attr" (tag, classes and attr optional)"""
+    tag: Optional[str]
+    classes: FrozenSet[str]
+    attr: Optional[str] = None
+
+    @classmethod
+    def compile(cls, text: str) -> "Selector":
+        text, _, attr = text.partition("@")
+        tag, *classes = text.split(".")
+        return cls(tag.lower() or None, frozenset(classes), attr.lower() or None)
+
+    def matches(self, tag: str, classes: FrozenSet[str]) -> bool:
+        return (self.tag is None or self.tag == tag) and self.classes <= classes
+
+
+@dataclass(frozen=True)
+class SiteSelectors:
+    """Where a site puts each ticket and its fields"""
+    ticket: Selector
+    event_name: Selector
+    venue: Selector
+    price: Selector
+    url: Selector
+
+    @classmethod
+    def compile(cls, ticket: str, event_name: str, venue: str,
+                price: str, url: str) -> "SiteSelectors":
+        return cls(Selector.compile(ticket), Selector.compile(event_name),
+                   Selector.compile(venue), Selector.compile(price), Selector.compile(url))
+
+
+DEFAULT_SELECTORS = SiteSelectors.compile(
+    ticket="div.ticket",
+    event_name=".event-name",
+    venue=".venue",
+    price=".price",
+    url="a@href",
+)
+
+# Keyed by host; anything not listed falls back to DEFAULT_SELECTORS
+SITE_SELECTORS: Dict[str, SiteSelectors] = {
+    "tickets.example.com": DEFAULT_SELECTORS,
+    "events.example.org": SiteSelectors.compile(
+        ticket="li.listing",
+        event_name="h3.title",
+        venue="span.location",
+        price="span.amount",
+        url="a.buy@href",
+    ),
+}
+
+
+def selectors_for(url: str) -> SiteSelectors:
+    return SITE_SELECTORS.get(urlsplit(url).netloc, DEFAULT_SELECTORS)
+
+
+def parse_price(text: str) -> Optional[float]:
+    match = PRICE_PATTERN.search(text)
+    return float(match.group().replace(",", "")) if match else None
+
+
+class TicketStreamParser(HTMLParser):
+    """
+    Feed HTML in arbitrary chunks; completed tickets collect in .tickets
+    and are handed out by drain().
+
+    Only a stack of open tag names is kept, and field text is buffered
+    only while inside a matching element, so memory is bounded by the
+    nesting depth and the size of a single ticket.
+    """
+
+    def __init__(self, selectors: SiteSelectors = DEFAULT_SELECTORS, base_url: str = ""):
+        super().__init__(convert_charrefs=True)
+        self.selectors = selectors
+        self.base_url = base_url
+        self.tickets: List[TicketInfo] = []
+        self._fields: Tuple[Tuple[str, Selector], ...] = (
+            ("event_name", selectors.event_name),
+            ("venue", selectors.venue),
+            ("price", selectors.price),
+        )
+        self._stack: List[str] = []
+        self._ticket_depth: Optional[int] = None
+        self._current: Dict[str, List[str]] = {}
+        self._href: Optional[str] = None
+        # (field name, stack depth) of the element whose text is being captured
+        self._capturing: List[Tuple[str, int]] = []
+
+    def handle_starttag(self, tag, attrs):
+        classes = frozenset()
+        for name, value in attrs:
+            if name == "class" and value:
+                classes = frozenset(value.split())
+                break
+
+        if tag in CLOSES_P:
+            self._close_open_p()
+
+        if (self._ticket_depth is not None and self._stack[self._ticket_depth] == tag
+                and self.selectors.ticket.matches(tag, classes)):
+            # A sibling ticket implicitly closes an unterminated one (<li>...<li>)
+            self._close(self._ticket_depth)
+
+        if self._ticket_depth is None:
+            if self.selectors.ticket.matches(tag, classes):
+                self._ticket_depth = len(self._stack)
+                self._current = {}
+                self._href = None
+        else:
+            for field, selector in self._fields:
+                if field not in self._current and selector.matches(tag, classes):
+                    self._current[field] = []
+                    self._capturing.append((field, len(self._stack)))
+            url = self.selectors.url
+            if self._href is None and url.matches(tag, classes):
+                self._href = dict(attrs).get(url.attr or "href")
+
+        if tag not in VOID_ELEMENTS:
+            self._stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self._close(len(self._stack) - 1)
+
+    def handle_endtag(self, tag):
+        # Pop to the matching open tag, tolerating unclosed <p>, <li>, ...
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth] == tag:
+                self._close(depth)
+                return
+
+    def _close_open_p(self) -> None:
+        """A block start tag ends an unterminated <p> (<p>A<p>B)"""
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth] == "p":
+                self._close(depth)
+                return
+            if self._stack[depth] in P_SCOPE:
+                return
+
+    def handle_data(self, data):
+        for field, _ in self._capturing:
+            self._current[field].append(data)
+
+    def _close(self, depth: int) -> None:
+        del self._stack[depth:]
+        while self._capturing and self._capturing[-1][1] >= depth:
+            self._capturing.pop()
+        if self._ticket_depth is not None and self._ticket_depth >= depth:
+            self._ticket_depth = None
+            self._emit()
+
+    def _emit(self) -> None:
+        text = {field: " ".join("".join(parts).split()) for field, parts in self._current.items()}
+        price = parse_price(text.get("price", ""))
+        if not text.get("event_name") or price is None:
+            return
+        self.tickets.append(TicketInfo(
+            event_name=text["event_name"],
+            venue=text.get("venue", ""),
+            price=price,
+            url=urljoin(self.base_url, self._href or ""),
+        ))
+
+    def close(self):
+        super().close()
+        # Flush a ticket left open by a truncated page
+        if self._stack:
+            self._close(0)
+
+    def drain(self) -> List[TicketInfo]:
+        tickets, self.tickets = self.tickets, []
+        return tickets
+
+
+def iter_tickets(chunks: Iterable[str], base_url: str = "",
+                 selectors: Optional[SiteSelectors] = None) -> Iterator[TicketInfo]:
+    """Yield tickets from HTML chunks as soon as each ticket element closes"""
+    parser = TicketStreamParser(selectors or selectors_for(base_url), base_url)
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.drain()
+    parser.close()
+    yield from parser.drain()
@@ -2,50 +2,61 @@
 Demo 4: Custom Instructions - Sample Domain Code
 ===============================================
 
-This code demonstrates web scraping domain patterns that will be
-enhanced when custom instructions are applied.
+This code demonstrates web scraping domain patterns: a scraper built on
+the rate-limited CrawlEngine and the streaming ticket extractor. Use it
+as the starting point for custom instructions (validation, logging,
+ethical scraping rules).
 """
 
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
-import requests
-import time
+from typing import Iterable, Iterator, List, Optional
 
+import requests
 
-@dataclass
-class TicketInfo:
-    """Basic ticket information - will be enhanced with custom instructions"""
-    event_name: str
-    venue: str
-    price: float
-    url: str
+from crawler import CrawlEngine, FetchResult
+from extractor import TicketInfo, iter_tickets
 
 
 class BasicScraper:
     """
-    Basic scraper that will be enhanced when custom instructions are applied.
-    This shows the 'before' state - Copilot will improve this significantly.
+    Ticket scraper: fetching goes through CrawlEngine (per-host rate
+    limits, retries, revalidation) and parsing through the streaming
+    extractor.
     """
 
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, engine: Optional[CrawlEngine] = None):
+        self.engine = engine or CrawlEngine()
+
+    def fetch_page(self, url: str) -> str:
+        """
+        Fetch one page through the crawl engine (rate limited, retried, revalidated).
+        Raises requests.RequestException if it could not be fetched.
+        """
+        result = self.engine.fetch(url)
+        if result.text is None or result.status >= 400:
+            raise requests.RequestException(
+                f"Failed to fetch {url}: {result.error or f'HTTP {result.status}'}"
+            )
+        return result.text
+
+    def fetch_pages(self, urls: Iterable[str]) -> Iterator[FetchResult]:
+        """Fetch many pages concurrently, yielding results as they complete"""
+        return self.engine.crawl(urls)
 
-    def fetch_page(self, url: str):
-        """Basic fetch - will be enhanced with rate limiting, error handling"""
-        response = self.session.get(url)
-        return response.text
+    def extract_tickets(self, html: str, url: str = "") -> List[TicketInfo]:
+        """Parse tickets out of a page using the selectors registered for its site"""
+        return list(iter_tickets([html], url))
 
-    def extract_tickets(self, html: str):
-        """Basic extraction - will be enhanced with proper parsing"""
-        # Simple placeholder - custom instructions will improve this
-        return []
+    def stream_tickets(self, url: str) -> Iterator[TicketInfo]:
+        """Yield tickets while the page is still downloading"""
+        return iter_tickets(self.engine.stream(url), url)
 
 
 if __name__ == "__main__":
-    print("🎫 Basic ticket scraper ready for custom instructions demo!")
-    print("📝 Apply web scraping custom instructions to see improvements:")
-    print("   - Rate limiting and retry mechanisms")
-    print("   - Proper error handling and logging")
-    print("   - Data validation with Pydantic models")
-    print("   - Ethical scraping practices")
-    print("\n🚀 Ask Copilot to enhance this code following custom instructions!")
+    print("🎫 Ticket scraper ready for custom instructions demo!")
+    print("✅ Already in place:")
+    print("   - Per-host rate limiting, retries with backoff, 304 revalidation")
+    print("   - Streaming extraction with per-site selectors")
+    print("📝 Apply web scraping custom instructions to add:")
+    print("   - Logging and data validation with Pydantic models")
+    print("   - Ethical scraping practices (robots.txt, terms of service)")
+    print("\n🚀 Ask Copilot to extend this code following custom instructions!")
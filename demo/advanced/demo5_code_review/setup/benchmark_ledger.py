@@ -0,0 +1,67 @@
+"""
+Settlement benchmark: BalanceLedger vs per-row update_user_balance
+=================================================================
+
+Both paths apply random (user_id, delta) events to a fresh SQLite
+database; the per-row path runs on a smaller sample because it pays a
+transaction per event.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from problematic_code import BalanceLedger, DatabaseManager, SQLitePool
+
+USER_COUNT = 10_000
+EVENT_COUNT = 1_000_000
+PER_ROW_EVENT_COUNT = 20_000
+
+
+def make_pool(directory, name):
+    pool = SQLitePool(os.path.join(directory, name))
+    with pool.transaction() as conn:
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, balance REAL NOT NULL)")
+        conn.executemany("INSERT INTO users VALUES (?, 0)", ((i,) for i in range(1, USER_COUNT + 1)))
+    return pool
+
+
+def make_events(count):
+    rng = random.Random(42)
+    return [(rng.randint(1, USER_COUNT), rng.randint(-500, 1000) / 100) for _ in range(count)]
+
+
+def main():
+    event_count = int(sys.argv[1]) if len(sys.argv) > 1 else EVENT_COUNT
+    events = make_events(event_count)
+
+    with tempfile.TemporaryDirectory() as directory:
+        pool = make_pool(directory, 'per_row.db')
+        db = DatabaseManager(pool)
+        sample = events[:PER_ROW_EVENT_COUNT]
+        start = time.perf_counter()
+        for user_id, delta in sample:
+            db.update_user_balance(user_id, delta)
+        per_row = len(sample) / (time.perf_counter() - start)
+        pool.close()
+
+        pool = make_pool(directory, 'ledger.db')
+        ledger = BalanceLedger(pool)
+        ledger.ensure_schema()
+        start = time.perf_counter()
+        ledger.record_many(events)
+        ledger.flush()
+        bulk = len(events) / (time.perf_counter() - start)
+        stats = ledger.stats()
+        pool.close()
+
+    print(f"Per-row update_user_balance: {per_row:>12,.0f} events/s ({len(sample):,} events)")
+    print(f"BalanceLedger:               {bulk:>12,.0f} events/s ({len(events):,} events, "
+          f"{stats['transactions']} transactions, {stats['rows_updated']:,} row updates)")
+    print(f"Speedup:                     {bulk / per_row:>12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Login throughput benchmark for UserManager.authenticateAndGetProfile
+===================================================================
+
+Registers many users with a cheap KDF cost (so setup finishes quickly),
+then measures logins per second. With the email index a login costs
+one dict lookup plus one password verification regardless of user count.
+Those rates show lookup overhead only; the last line times one
+verification at the production PASSWORD_HASH_ITERATIONS, which is what
+bounds real login throughput.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from problematic_code import UserManager
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # demo/advanced, for demo_common
+from demo_common.passwords import PASSWORD_HASH_ITERATIONS, hash_password, verify_password
+
+USER_COUNT = 1_000_000
+LOGIN_COUNT = 10_000
+PRODUCTION_SAMPLES = 5
+
+
+def main():
+    user_count = int(sys.argv[1]) if len(sys.argv) > 1 else USER_COUNT
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    manager = UserManager(password_iterations=iterations)
+    start = time.perf_counter()
+    for i in range(user_count):
+        manager.createUser(f"user{i}", f"user{i}@example.com", f"password{i}")
+    print(f"Registered {user_count:,} users in {time.perf_counter() - start:.1f}s "
+          f"(KDF iterations: {iterations:,}; production uses {PASSWORD_HASH_ITERATIONS:,})")
+    if iterations != PASSWORD_HASH_ITERATIONS:
+        print("Login rates below use the benchmark KDF cost, not the production one")
+
+    start = time.perf_counter()
+    for i in range(LOGIN_COUNT):
+        n = (i * 7919) % user_count
+        assert manager.authenticateAndGetProfile(f"user{n}@example.com", f"password{n}")
+    elapsed = time.perf_counter() - start
+    print(f"Successful logins: {LOGIN_COUNT / elapsed:,.0f}/s")
+
+    start = time.perf_counter()
+    for i in range(LOGIN_COUNT):
+        assert manager.authenticateAndGetProfile(f"missing{i}@example.com", "x") is None
+    elapsed = time.perf_counter() - start
+    print(f"Unknown-email logins: {LOGIN_COUNT / elapsed:,.0f}/s")
+
+    encoded = hash_password("password", PASSWORD_HASH_ITERATIONS)
+    start = time.perf_counter()
+    for _ in range(PRODUCTION_SAMPLES):
+        verify_password("password", encoded)
+    per_login = (time.perf_counter() - start) / PRODUCTION_SAMPLES
+    print(f"At {PASSWORD_HASH_ITERATIONS:,} KDF iterations: {per_login * 1000:.0f} ms per login "
+          f"({1 / per_login:,.0f}/s per core)")
+
+
+if __name__ == "__main__":
+    main()
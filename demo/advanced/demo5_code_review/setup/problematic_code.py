@@ -8,60 +8,158 @@ how Copilot assists in comprehensive code reviews.
 WARNING: This code is intentionally problematic for demonstration purposes!
 """
 
-import hashlib
 import sqlite3
+import sys
+import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # demo/advanced, for demo_common
+from demo_common.passwords import PASSWORD_HASH_ITERATIONS, hash_password, verify_password
+from demo_common.sqlite_pool import SQLitePool
 
 
 # ❌ Multiple code quality issues for review demonstration
 class UserManager:
     """User management with various code quality issues"""
 
-    def __init__(self):
+    def __init__(self, password_iterations=PASSWORD_HASH_ITERATIONS):
         self.users = {}  # ❌ Using dict instead of proper data structure
+        self.users_by_email = {}  # Unique email -> user_id index
+        self.next_user_id = 1
         self.db_connection = None  # ❌ No dependency injection
+        self.password_iterations = password_iterations
+        # Verified against for unknown emails so timing doesn't reveal them
+        self._dummy_hash = None
 
     def createUser(self, name, email, password):  # ❌ Naming convention, no type hints
         """❌ Missing type hints and proper validation"""
         if not name:  # ❌ Insufficient validation
             return False
 
-        # ❌ Direct password storage (security issue)
-        user_id = len(self.users) + 1  # ❌ Poor ID generation
+        if email in self.users_by_email:
+            return False
+
+        user_id = self.next_user_id
+        self.next_user_id += 1
         self.users[user_id] = {
             'name': name,
             'email': email,
-            'password': password,  # ❌ Plain text password
+            'password_hash': hash_password(password, self.password_iterations),
             'created': datetime.now()
         }
-
+        self.users_by_email[email] = user_id
         return user_id
 
     def get_user(self, user_id):  # ❌ Inconsistent naming, no error handling
         return self.users[user_id]  # ❌ KeyError potential
 
     def deleteUser(self, user_id):  # ❌ No soft delete, no cascading
-        del self.users[user_id]  # ❌ Hard delete, no backup
+        user = self.users.pop(user_id)  # ❌ Hard delete, no backup
+        del self.users_by_email[user['email']]
         return True
 
     # ❌ Method doing too many things
     def authenticateAndGetProfile(self, email, password):
-        for user_id, user in self.users.items():
-            if user['email'] == email and user['password'] == password:  # ❌ Plain text comparison
-                # ❌ Returning sensitive data
-                return {
-                    'id': user_id,
-                    'name': user['name'],
-                    'email': user['email'],
-                    'password': user['password']  # ❌ Exposing password
-                }
-        return None
+        user_id = self.users_by_email.get(email)
+        if user_id is None:
+            if self._dummy_hash is None:
+                self._dummy_hash = hash_password('', self.password_iterations)
+            verify_password(password, self._dummy_hash)
+            return None
+
+        user = self.users[user_id]
+        if not verify_password(password, user['password_hash']):
+            return None
+
+        return {
+            'id': user_id,
+            'name': user['name'],
+            'email': user['email']
+        }
+
+
+class IndexedUserStore:
+    """User records with hash indexes on chosen fields.
+
+    find() plans each query: it starts from the most selective indexed
+    criterion, intersects the candidate sets of the other indexed ones,
+    and only checks unindexed criteria against those candidates. A full
+    scan happens only when no criterion is indexed.
+    """
+
+    def __init__(self, indexed_fields: Iterable[str] = ("email", "name")):
+        self.users: Dict[int, Dict[str, Any]] = {}
+        self.indexes: Dict[str, Dict[Any, Set[int]]] = {field: {} for field in indexed_fields}
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    def items(self):
+        return self.users.items()
+
+    def _index(self, user_id: int, user: Dict[str, Any]) -> None:
+        for field, index in self.indexes.items():
+            if field in user:
+                index.setdefault(user[field], set()).add(user_id)
+
+    def _unindex(self, user_id: int, user: Dict[str, Any]) -> None:
+        for field, index in self.indexes.items():
+            if field in user:
+                postings = index[user[field]]
+                postings.discard(user_id)
+                if not postings:
+                    del index[user[field]]
+
+    def add(self, user_id: int, user: Dict[str, Any]) -> None:
+        if user_id in self.users:
+            self._unindex(user_id, self.users[user_id])
+        self.users[user_id] = user
+        self._index(user_id, user)
+
+    def remove(self, user_id: int) -> Optional[Dict[str, Any]]:
+        user = self.users.pop(user_id, None)
+        if user is not None:
+            self._unindex(user_id, user)
+        return user
+
+    def update(self, user_id: int, changes: Dict[str, Any]) -> None:
+        self.add(user_id, {**self.users[user_id], **changes})
+
+    def find(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        indexed = []
+        unindexed = []
+        for field, value in criteria.items():
+            try:
+                hash(value)
+            except TypeError:
+                unindexed.append((field, value))
+                continue
+            if field in self.indexes:
+                indexed.append(self.indexes[field].get(value, set()))
+            else:
+                unindexed.append((field, value))
+
+        if indexed:
+            indexed.sort(key=len)
+            candidate_ids = indexed[0].intersection(*indexed[1:])
+            candidates = (self.users[user_id] for user_id in sorted(candidate_ids))
+        else:
+            candidates = self.users.values()
+
+        return [
+            user for user in candidates
+            if all(field in user and user[field] == value for field, value in unindexed)
+        ]
 
 
 # ❌ Performance issues and poor patterns
 def find_users_by_criteria(users, criteria):  # ❌ No type hints
     """❌ Inefficient algorithm and no optimization"""
+    if isinstance(users, IndexedUserStore):
+        return users.find(criteria)
+
     results = []
 
     # ❌ O(n²) complexity when could be O(n)
@@ -77,24 +175,133 @@ def find_users_by_criteria(users, criteria):  # ❌ No type hints
     return results
 
 
-# ❌ SQL injection and database issues
 class DatabaseManager:
-    def __init__(self):
-        self.connection = None
+    def __init__(self, pool: Optional[SQLitePool] = None):
+        self.pool = pool or SQLitePool('users.db')
 
     def get_user_by_email(self, email):
-        """❌ SQL injection vulnerability"""
-        cursor = self.connection.cursor()
-        # Vulnerable query construction
-        query = f"SELECT * FROM users WHERE email = '{email}'"  # ❌ SQL injection risk
-        cursor.execute(query)
-        return cursor.fetchone()
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
 
     def update_user_balance(self, user_id, amount):
-        """❌ No transaction handling for financial operations"""
-        cursor = self.connection.cursor()
-        query = f"UPDATE users SET balance = balance + {amount} WHERE id = {user_id}"
-        cursor.execute(query)  # ❌ No commit, no error handling
+        with self.pool.transaction() as conn:
+            conn.execute("UPDATE users SET balance = balance + ? WHERE id = ?", (amount, user_id))
+
+    def update_user_balances(self, updates: Iterable[Tuple[int, float]]) -> None:
+        """Apply many (user_id, amount) balance changes in one transaction"""
+        with self.pool.transaction() as conn:
+            conn.executemany(
+                "UPDATE users SET balance = balance + ? WHERE id = ?",
+                ((amount, user_id) for user_id, amount in updates)
+            )
+
+
+class BalanceLedger:
+    """Bulk settlement of (user_id, delta) balance events.
+
+    Events are buffered and aggregated per user; every chunk_size events
+    are applied in one transaction that appends each raw event to the
+    balance_ledger audit table and issues one UPDATE per distinct user.
+    A chunk that names a user missing from the users table is rolled back,
+    so no event is audited without its balance change; the events for the
+    unknown users move to rejected_events and the rest stay pending.
+    """
+
+    def __init__(self, pool: SQLitePool, chunk_size: int = 50_000):
+        self.pool = pool
+        self.chunk_size = chunk_size
+        self.pending_events: List[Tuple[int, float]] = []
+        self.pending_totals: Dict[int, float] = {}
+        self.rejected_events: List[Tuple[int, float]] = []
+        self.events_applied = 0
+        self.rows_updated = 0
+        self.transactions = 0
+        self.apply_seconds = 0.0
+
+    def ensure_schema(self) -> None:
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS balance_ledger ("
+                " id INTEGER PRIMARY KEY,"
+                " user_id INTEGER NOT NULL,"
+                " delta REAL NOT NULL,"
+                " recorded_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+            )
+
+    def record(self, user_id: int, delta: float) -> None:
+        self.pending_events.append((user_id, delta))
+        self.pending_totals[user_id] = self.pending_totals.get(user_id, 0) + delta
+        if len(self.pending_events) >= self.chunk_size:
+            self.flush()
+
+    def record_many(self, events: Iterable[Tuple[int, float]]) -> None:
+        for user_id, delta in events:
+            self.record(user_id, delta)
+
+    def flush(self) -> None:
+        """Apply all buffered events in a single transaction"""
+        if not self.pending_events:
+            return
+
+        start = time.perf_counter()
+        unknown: List[int] = []
+        try:
+            with self.pool.transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO balance_ledger (user_id, delta) VALUES (?, ?)",
+                    self.pending_events
+                )
+                changes_before = conn.total_changes
+                conn.executemany(
+                    "UPDATE users SET balance = balance + ? WHERE id = ?",
+                    ((total, user_id) for user_id, total in self.pending_totals.items())
+                )
+                if conn.total_changes - changes_before != len(self.pending_totals):
+                    unknown = self._unknown_users(conn)
+                    raise LookupError(f"Unknown user ids: {unknown} "
+                                      f"(their events were moved to rejected_events)")
+        except LookupError:
+            if unknown:
+                self._reject(unknown)
+            raise
+        self.apply_seconds += time.perf_counter() - start
+
+        self.events_applied += len(self.pending_events)
+        self.rows_updated += len(self.pending_totals)
+        self.transactions += 1
+        self.pending_events = []
+        self.pending_totals = {}
+
+    def _reject(self, user_ids: List[int]) -> None:
+        """Move the pending events of user_ids to rejected_events"""
+        rejected = set(user_ids)
+        kept = []
+        for event in self.pending_events:
+            (self.rejected_events if event[0] in rejected else kept).append(event)
+        self.pending_events = kept
+        for user_id in rejected:
+            del self.pending_totals[user_id]
+
+    def _unknown_users(self, conn: sqlite3.Connection) -> List[int]:
+        user_ids = list(self.pending_totals)
+        known = set()
+        for start in range(0, len(user_ids), 500):
+            batch = user_ids[start:start + 500]
+            placeholders = ", ".join("?" * len(batch))
+            known.update(row[0] for row in conn.execute(
+                f"SELECT id FROM users WHERE id IN ({placeholders})", batch))
+        return sorted(user_id for user_id in user_ids if user_id not in known)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'events_applied': self.events_applied,
+            'rows_updated': self.rows_updated,
+            'transactions': self.transactions,
+            'pending_events': len(self.pending_events),
+            'rejected_events': len(self.rejected_events),
+            'events_per_second': (self.events_applied / self.apply_seconds
+                                  if self.apply_seconds else 0.0)
+        }
 
 
 # ❌ Payment processing with security issues
@@ -147,7 +354,7 @@ class AppConfig:
 if __name__ == "__main__":
     print("📋 Code ready for comprehensive review demonstration!")
     print("🔍 Issues to be identified by Copilot:")
-    print("   - Security vulnerabilities (SQL injection, hardcoded secrets)")
+    print("   - Security vulnerabilities (hardcoded secrets, unprotected card data)")
     print("   - Performance bottlenecks (O(n²) algorithms)")
     print("   - Code quality issues (naming, type hints, error handling)")
     print("   - Architecture problems (tight coupling, SRP violations)")
@@ -0,0 +1,8 @@
+"""
+Shared helpers for the advanced demos
+=====================================
+
+Code that several demos' setup files need, kept in one place instead of
+pasted into each demo. Setup files put demo/advanced on sys.path and
+import from here.
+"""
@@ -0,0 +1,28 @@
+"""
+Password hashing shared by the demos
+====================================
+
+Salted PBKDF2-SHA256 with a tunable cost, encoded as
+'pbkdf2_sha256$iterations$salt$hash' so the cost travels with the hash.
+"""
+
+import hashlib
+import hmac
+import secrets
+
+# Cost of the password KDF; raise it as hardware gets faster
+PASSWORD_HASH_ITERATIONS = 200_000
+
+
+def hash_password(password: str, iterations: int = PASSWORD_HASH_ITERATIONS) -> str:
+    """Salted PBKDF2-SHA256 hash encoded as 'pbkdf2_sha256$iterations$salt$hash'"""
+    salt = secrets.token_bytes(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations)
+    return f"pbkdf2_sha256${iterations}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    """Check a password against hash_password output in constant time"""
+    _, iterations, salt, expected = encoded.split('$')
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), bytes.fromhex(salt), int(iterations))
+    return hmac.compare_digest(digest.hex(), expected)
@@ -0,0 +1,119 @@
+"""
+SQLite connection pool shared by the demos
+==========================================
+
+Connections are opened lazily up to a fixed size, in WAL mode, and
+reused so each lookup skips connect() and re-parsing its statements.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Set
+
+
+class SQLitePool:
+    """Shared pool of SQLite connections.
+
+    Connections are opened once in WAL mode and reused, so each lookup
+    skips connect() and, thanks to sqlite3's per-connection statement
+    cache, re-parsing the same parameterized query. Borrowing waits at
+    most timeout seconds for a connection before raising TimeoutError.
+    """
+
+    def __init__(self, path: str, size: int = 5, cached_statements: int = 128,
+                 timeout: float = 30.0):
+        self.path = path
+        self.size = size
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        # Every connection opened since the last close(), idle or borrowed
+        self._connections: Set[sqlite3.Connection] = set()
+        self._opened = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False,
+                               cached_statements=self.cached_statements)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _open(self, generation: int) -> sqlite3.Connection:
+        """Open a connection for a slot already counted in _opened"""
+        try:
+            conn = self._connect()
+        except BaseException:
+            with self._lock:
+                if generation == self._generation:
+                    self._opened -= 1  # give the slot back
+            raise
+        with self._lock:
+            if generation == self._generation:
+                self._connections.add(conn)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                generation = self._generation
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                return self._open(generation)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"No connection to {self.path} free within {self.timeout}s")
+            # Wake up now and then: a slot can also free up without a put()
+            # (failed connect, close()), so re-check whether one can be opened
+            try:
+                return self._idle.get(timeout=min(remaining, 0.1))
+            except queue.Empty:
+                pass
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, opening one lazily while under size"""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                stale = conn not in self._connections
+                if not stale:
+                    self._idle.put(conn)
+            if stale:
+                conn.close()  # borrowed before close(): retire it now
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection and commit on success, roll back on error"""
+        with self.connection() as conn:
+            with conn:
+                yield conn
+
+    def close(self) -> None:
+        """Close idle connections now and borrowed ones as they are returned"""
+        with self._lock:
+            self._connections = set()
+            self._opened = 0
+            self._generation += 1
+            idle = []
+            while True:
+                try:
+                    idle.append(self._idle.get_nowait())
+                except queue.Empty:
+                    break
+        for conn in idle:
+            conn.close()
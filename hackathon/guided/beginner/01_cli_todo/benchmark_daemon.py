@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Per-command latency of todo.py, direct file access vs the daemon.
+
+Builds a temporary list of TASKS tasks (TODO_DB points todo.py at it),
+times each command as a fresh `python todo.py ...` process, then starts
+`todo.py daemon` and times the same commands again.
+
+Usage: python benchmark_daemon.py [tasks] [runs]
+"""
+from __future__ import annotations
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TASKS = 100_000
+RUNS = 20
+STARTUP_TIMEOUT = 30.0
+TODO = Path(__file__).with_name("todo.py")
+COMMANDS = [["list", "3"], ["add", "benchmark task"], ["done", "7"]]
+
+
+def run(args: list[str], env: dict, flags: list[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *flags, str(TODO), *args], env=env,
+                   stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def report(label: str, env: dict, runs: int, flags: list[str] | None = None) -> None:
+    flags = flags or []
+    for args in COMMANDS:
+        samples = sorted(run(args, env, flags) for _ in range(runs))
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(f"{label:<18} {' '.join(args):<20} "
+              f"median {statistics.median(samples) * 1000:7.1f} ms   p95 {p95 * 1000:7.1f} ms")
+
+
+def main() -> None:
+    tasks = int(sys.argv[1]) if len(sys.argv) > 1 else TASKS
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else RUNS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "todo.json"
+        sys.path.insert(0, str(TODO.parent))
+        from journal import TaskJournal
+        TaskJournal(db).replace_all([{"description": f"task {i}", "done": False}
+                                     for i in range(tasks)])
+        env = dict(os.environ, TODO_DB=str(db))
+        print(f"{tasks} tasks, {runs} runs per command\n")
+
+        report("direct", env, runs)
+
+        daemon = subprocess.Popen([sys.executable, str(TODO), "daemon"], env=env,
+                                  stdout=subprocess.DEVNULL)
+        socket_file = db.with_suffix(".sock")
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while not socket_file.exists():
+            if daemon.poll() is not None or time.monotonic() > deadline:
+                daemon.kill()
+                sys.exit(f"daemon did not start listening within {STARTUP_TIMEOUT:.0f}s")
+            time.sleep(0.01)
+        try:
+            report("daemon", env, runs)
+            report("daemon, python -S", env, runs, ["-S"])
+        finally:
+            subprocess.run([sys.executable, str(TODO), "stop"], env=env, stdout=subprocess.DEVNULL)
+            daemon.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Resident to-do daemon.
+
+`python todo.py daemon` keeps the task list in memory and serves CLI
+commands over a Unix domain socket, so a command costs a connect and a
+round trip instead of imports and a file read. Writes still go through
+the journal, so the files on disk stay authoritative and direct-mode
+CLIs (or a restarted daemon) see every change.
+
+Wire format: the client sends its arguments joined by NUL and shuts down
+its write side; the daemon replies with the command's output.
+"""
+
+from __future__ import annotations
+import io
+import os
+import socket
+import socketserver
+import threading
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from journal import TaskJournal
+
+
+class ResidentStore:
+    """In-memory task list in front of a TaskJournal (same interface)."""
+
+    def __init__(self, journal: TaskJournal):
+        self.journal = journal
+        self.snapshot = journal.snapshot
+        self.tasks: List[Dict] = []
+        self.signature: Tuple = ()
+        with journal.locked():
+            self._reload()
+
+    def _signature(self) -> Tuple:
+        stats = []
+        for path in (self.journal.snapshot, self.journal.journal):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                stats.append(None)
+            else:
+                stats.append((stat.st_size, stat.st_mtime_ns))
+        return tuple(stats)
+
+    def _reload(self) -> None:
+        self.tasks = self.journal.all()
+        self.signature = self._signature()
+
+    def _refresh(self) -> None:
+        """Reload if anything but this daemon wrote the files (must hold the lock)."""
+        if self._signature() != self.signature:
+            self._reload()
+
+    def add(self, description: str) -> int:
+        with self.journal.locked():
+            self._refresh()
+            number = self.journal.add(description)
+            self.tasks.append({"description": description, "done": False})
+            self.signature = self._signature()
+            return number
+
+    def mark_done(self, number: int) -> bool:
+        with self.journal.locked():
+            self._refresh()
+            if not self.journal.mark_done(number):
+                return False
+            self.tasks[number - 1]["done"] = True
+            self.signature = self._signature()
+            return True
+
+    def replace_all(self, tasks: List[Dict]) -> None:
+        with self.journal.locked():
+            self.journal.replace_all(tasks)
+            self.tasks = [dict(task) for task in tasks]
+            self.signature = self._signature()
+
+    def page(self, start: int, count: int) -> List[Tuple[int, Dict]]:
+        with self.journal.locked():
+            self._refresh()
+        start = max(start, 1)
+        return [(number, dict(task)) for number, task in
+                enumerate(self.tasks[start - 1:start - 1 + count], start)]
+
+    def all(self) -> List[Dict]:
+        with self.journal.locked():
+            self._refresh()
+        return [dict(task) for task in self.tasks]
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+
+def is_running(socket_file: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_file))
+        except OSError:
+            return False
+    return True
+
+
+def serve(socket_file: Path, run: Callable[[List[str]], None]) -> None:
+    """Answer commands on socket_file by calling run(argv) until told to stop."""
+    if is_running(socket_file):
+        print("Daemon already running.")
+        return
+    if socket_file.exists():
+        socket_file.unlink()  # left behind by a daemon that died
+
+    server: Optional[socketserver.UnixStreamServer] = None
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            data = self.rfile.read()
+            if not data:
+                return  # an is_running() probe
+            args = data.decode().split("\0")
+            if args == ["stop"]:
+                self.wfile.write(b"Daemon stopped.\n")
+                threading.Thread(target=server.shutdown).start()
+                return
+            if args[:1] == ["daemon"]:
+                self.wfile.write(b"Daemon already running.\n")
+                return
+
+            output = io.StringIO()
+            with redirect_stdout(output):
+                try:
+                    run(["todo.py", *args])
+                except Exception as exc:  # keep serving other clients
+                    print(f"Error: {exc}")
+            try:
+                self.wfile.write(output.getvalue().encode())
+            except BrokenPipeError:
+                pass  # client went away; the command itself has been applied
+
+    old_umask = os.umask(0o077)  # socket only usable by its owner
+    try:
+        server = socketserver.UnixStreamServer(str(socket_file), Handler)
+    finally:
+        os.umask(old_umask)
+    print(f"Daemon listening on {socket_file}")
+    try:
+        with server:
+            server.serve_forever()
+    finally:
+        socket_file.unlink(missing_ok=True)
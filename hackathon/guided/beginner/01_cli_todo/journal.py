@@ -0,0 +1,303 @@
+"""
+Append-only journal storage for the to-do list.
+
+Three files sit next to the JSON database:
+
+* ``todo.json``    – snapshot: a JSON array written one task per line, so
+                     it is still plain JSON but every task has a byte offset
+* ``todo.journal`` – JSON Lines appended since the snapshot:
+                     ``{"op": "add", "id": 7, "task": {...}}`` and
+                     ``{"op": "done", "id": 7}``
+* ``todo.idx``     – fixed-width index: a header, then one 9-byte record
+                     (offset, flags) per task, so a page of tasks is a seek
+
+Adding or completing a task appends one journal line and touches one index
+record. When the journal outgrows half the snapshot it is folded into a new
+snapshot. Ids are task numbers, so replaying a journal record that is
+already in the snapshot or the index is harmless; the index is rebuilt from
+the snapshot and journal whenever it does not match them.
+"""
+
+from __future__ import annotations
+import json
+import os
+import struct
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-user, no cross-process locking
+    fcntl = None
+
+HEADER = struct.Struct("<4sQQQQ")  # magic, snapshot size, mtime_ns, task count, journal length
+ENTRY = struct.Struct("<QB")       # byte offset, flags
+MAGIC = b"TDX1"
+IN_JOURNAL = 1
+DONE = 2
+MIN_COMPACT_BYTES = 1024 * 1024
+
+
+def _snapshot_lines(tasks: List[Dict]) -> Iterator[bytes]:
+    yield b"[\n"
+    for i, task in enumerate(tasks):
+        yield json.dumps(task).encode() + (b",\n" if i < len(tasks) - 1 else b"\n")
+    yield b"]\n"
+
+
+def _parse_line(line: bytes) -> Dict:
+    return json.loads(line.rstrip().rstrip(b","))
+
+
+class TaskJournal:
+    """Task list stored as snapshot + journal + index (see module docstring)."""
+
+    def __init__(self, snapshot: Path, min_compact_bytes: int = MIN_COMPACT_BYTES):
+        self.snapshot = Path(snapshot)
+        self.journal = self.snapshot.with_suffix(".journal")
+        self.index = self.snapshot.with_suffix(".idx")
+        self.lock_file = self.snapshot.with_suffix(".lock")
+        self.min_compact_bytes = min_compact_bytes
+        self.snapshot_count = 0
+        self.journal_len = 0
+        self.count = 0
+        self._lock_depth = 0
+
+    # -- locking --------------------------------------------------------
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold the cross-process lock (re-entrant) with the index caught up."""
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+
+        # Exclusive even for reads: catching up the index may write to it
+        with open(self.lock_file, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            self._lock_depth = 1
+            try:
+                self._sync()
+                yield
+            finally:
+                self._lock_depth = 0
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # -- index maintenance ----------------------------------------------
+
+    def _snapshot_stat(self) -> Tuple[int, int]:
+        try:
+            stat = self.snapshot.stat()
+        except FileNotFoundError:
+            return 0, 0
+        return stat.st_size, stat.st_mtime_ns
+
+    def _write_header(self, idx) -> None:
+        size, mtime_ns = self._snapshot_stat()
+        idx.seek(0)
+        idx.write(HEADER.pack(MAGIC, size, mtime_ns, self.snapshot_count, self.journal_len))
+
+    def _write_entry(self, idx, number: int, offset: int, flags: int) -> None:
+        idx.seek(HEADER.size + (number - 1) * ENTRY.size)
+        idx.write(ENTRY.pack(offset, flags))
+
+    def _sync(self) -> None:
+        """Bring the index up to date with the snapshot and journal on disk."""
+        if not self.journal.exists():
+            self.journal.touch()
+        journal_size = self.journal.stat().st_size
+        try:
+            with open(self.index, "rb") as idx:
+                header = idx.read(HEADER.size)
+                index_size = os.fstat(idx.fileno()).st_size
+        except FileNotFoundError:
+            header = b""
+
+        if len(header) == HEADER.size:
+            magic, size, mtime_ns, snapshot_count, journal_len = HEADER.unpack(header)
+            if (magic == MAGIC and (size, mtime_ns) == self._snapshot_stat()
+                    and journal_len <= journal_size):
+                self.snapshot_count = snapshot_count
+                self.journal_len = journal_len
+                self.count = (index_size - HEADER.size) // ENTRY.size
+                if journal_len < journal_size:
+                    with open(self.index, "r+b") as idx:
+                        self._replay(idx, journal_len)
+                return
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        offsets: List[Tuple[int, int]] = []
+        if self.snapshot.exists() and self.snapshot.stat().st_size:
+            try:
+                offsets = self._scan_snapshot()
+            except ValueError:
+                # Not one task per line (e.g. written by hand): rewrite it
+                with open(self.snapshot, encoding="utf-8") as f:
+                    self._write_snapshot(json.load(f))
+                offsets = self._scan_snapshot()
+
+        tmp = self.index.with_suffix(".idx.tmp")
+        with open(tmp, "w+b") as idx:
+            self.snapshot_count = self.count = len(offsets)
+            self.journal_len = 0
+            idx.write(b"\0" * HEADER.size)
+            for offset, flags in offsets:
+                idx.write(ENTRY.pack(offset, flags))
+            self._replay(idx, 0)
+        os.replace(tmp, self.index)
+
+    def _scan_snapshot(self) -> List[Tuple[int, int]]:
+        offsets = []
+        with open(self.snapshot, "rb") as f:
+            if f.readline().strip() != b"[":
+                raise ValueError("snapshot is not line-addressable")
+            offset = f.tell()
+            for line in f:
+                if line.strip() not in (b"]", b""):
+                    task = _parse_line(line)
+                    offsets.append((offset, DONE if task.get("done") else 0))
+                offset += len(line)
+        return offsets
+
+    def _replay(self, idx, start: int) -> None:
+        """Apply journal records from byte `start`; a torn last line is dropped."""
+        with open(self.journal, "r+b") as journal:
+            journal.seek(start)
+            offset = start
+            for line in journal:
+                if not line.endswith(b"\n"):
+                    journal.truncate(offset)
+                    break
+                record = json.loads(line)
+                number = record["id"]
+                if record["op"] == "add" and number > self.snapshot_count:
+                    flags = IN_JOURNAL | (DONE if record["task"].get("done") else 0)
+                    self._write_entry(idx, number, offset, flags)
+                    self.count = max(self.count, number)
+                elif record["op"] == "done" and number <= self.count:
+                    idx.seek(HEADER.size + (number - 1) * ENTRY.size)
+                    entry_offset, flags = ENTRY.unpack(idx.read(ENTRY.size))
+                    self._write_entry(idx, number, entry_offset, flags | DONE)
+                offset += len(line)
+        self.journal_len = offset
+        self._write_header(idx)
+
+    # -- writes ---------------------------------------------------------
+
+    def _append(self, record: Dict) -> None:
+        line = json.dumps(record).encode() + b"\n"
+        with open(self.journal, "ab") as journal:
+            journal.write(line)
+        with open(self.index, "r+b") as idx:
+            self._replay(idx, self.journal_len)
+        if self.journal_len > max(self.min_compact_bytes, self._snapshot_stat()[0] // 2):
+            self._compact()
+
+    def add(self, description: str) -> int:
+        """Append a new task and return its 1-based number."""
+        with self.locked():
+            number = self.count + 1
+            self._append({"op": "add", "id": number,
+                          "task": {"description": description, "done": False}})
+            return number
+
+    def mark_done(self, number: int) -> bool:
+        with self.locked():
+            if not 1 <= number <= self.count:
+                return False
+            self._append({"op": "done", "id": number})
+            return True
+
+    def _write_snapshot(self, tasks: List[Dict]) -> None:
+        tmp = self.snapshot.with_suffix(".json.tmp")
+        with open(tmp, "wb") as f:
+            f.writelines(_snapshot_lines(tasks))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot)
+
+    def _compact(self) -> None:
+        # The journal is only emptied after the new snapshot is in place;
+        # replaying a leftover journal against it is a no-op (ids <= count).
+        self._write_snapshot(self._read_all())
+        with open(self.journal, "wb"):
+            pass
+        self._rebuild()
+
+    def compact(self) -> None:
+        """Fold the journal into a fresh snapshot."""
+        with self.locked():
+            self._compact()
+
+    def replace_all(self, tasks: List[Dict]) -> None:
+        """Overwrite the whole list (snapshot written first, then journal cleared)."""
+        with self.locked():
+            self._write_snapshot(tasks)
+            with open(self.journal, "wb"):
+                pass
+            self._rebuild()
+
+    # -- reads ----------------------------------------------------------
+
+    def __len__(self) -> int:
+        with self.locked():
+            return self.count
+
+    def _read(self, start: int, stop: int) -> List[Tuple[int, Dict]]:
+        stop = min(stop, self.count + 1)
+        if start >= stop:
+            return []
+        with open(self.index, "rb") as idx:
+            idx.seek(HEADER.size + (start - 1) * ENTRY.size)
+            entries = list(ENTRY.iter_unpack(idx.read((stop - start) * ENTRY.size)))
+
+        tasks = []
+        files: Dict[bool, Optional[object]] = {}
+        try:
+            for number, (offset, flags) in enumerate(entries, start):
+                in_journal = bool(flags & IN_JOURNAL)
+                f = files.get(in_journal)
+                if f is None:
+                    f = files[in_journal] = open(self.journal if in_journal else self.snapshot, "rb")
+                f.seek(offset)
+                record = _parse_line(f.readline())
+                task = dict(record["task"] if in_journal else record)
+                task["done"] = bool(flags & DONE)
+                tasks.append((number, task))
+        finally:
+            for f in files.values():
+                f.close()
+        return tasks
+
+    def page(self, start: int, count: int) -> List[Tuple[int, Dict]]:
+        """(number, task) pairs for tasks start .. start + count - 1 (1-based)."""
+        with self.locked():
+            return self._read(max(start, 1), max(start, 1) + count)
+
+    def _read_all(self) -> List[Dict]:
+        # Whole list: one json.load of the snapshot plus a pass over the journal
+        tasks: List[Dict] = []
+        if self.snapshot_count:
+            with open(self.snapshot, "rb") as f:
+                tasks = json.load(f)
+        with open(self.journal, "rb") as journal:
+            for line in journal.read(self.journal_len).splitlines():
+                record = json.loads(line)
+                number = record["id"]
+                if record["op"] == "add" and number > len(tasks):
+                    tasks.append(dict(record["task"]))
+                elif record["op"] == "done" and number <= len(tasks):
+                    tasks[number - 1]["done"] = True
+        return tasks
+
+    def all(self) -> List[Dict]:
+        with self.locked():
+            return self._read_all()
@@ -4,61 +4,156 @@ CLI To‑Do List Manager.
 
 Commands:
   add "task description"
-  list
+  list [page]       # all tasks, or one page of PAGE_SIZE
   done <number>     # optional
+  daemon            # keep tasks in memory and serve the commands above
+  stop              # stop the daemon
+
+When a daemon is listening on SOCKET_FILE the commands are forwarded to
+it; otherwise they read and write the files directly.
 """
 from __future__ import annotations
-import json
+import os
+import socket
 import sys
+import time
 from pathlib import Path
-from typing import List, Dict
-
-DB_FILE = Path(__file__).with_suffix('.json')
+from typing import List, Dict, Optional
+
+DB_FILE = Path(os.environ.get("TODO_DB") or Path(__file__).with_suffix('.json'))
+SOCKET_FILE = DB_FILE.with_suffix('.sock')
+PAGE_SIZE = 50
+DAEMON_TIMEOUT = 10.0  # seconds to wait for the daemon to answer
+
+_store = None
+
+
+def store():
+    """Storage for DB_FILE: the journal, or the daemon's in-memory copy of it."""
+    global _store
+    if _store is None or _store.snapshot != DB_FILE:
+        # Imported here so commands answered by the daemon never load it
+        from journal import TaskJournal
+        _store = TaskJournal(DB_FILE)
+    return _store
+
+
+def send_to_daemon(args: List[str]) -> Optional[str]:
+    """Run a command in the daemon and return its output, or None if none is running.
+
+    Raises OSError (socket.timeout) if the daemon does not answer within DAEMON_TIMEOUT.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with sock:
+        deadline = time.monotonic() + DAEMON_TIMEOUT
+        sock.settimeout(DAEMON_TIMEOUT)
+        try:
+            sock.connect(str(SOCKET_FILE))
+        except OSError:
+            return None
+        # Past this point the daemon may have run the command: never fall back
+        sock.sendall("\0".join(args).encode())
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            sock.settimeout(max(deadline - time.monotonic(), 0.001))
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b"".join(chunks).decode()
+
+
+def run_daemon() -> None:
+    """Serve commands from memory until `todo.py stop`."""
+    from daemon import ResidentStore, serve
+
+    global _store
+    _store = ResidentStore(store())
+    serve(SOCKET_FILE, main)
 
 
 def load_tasks() -> List[Dict]:
     """Load tasks from DB_FILE. Return [] if file missing."""
-    # TODO: implement
+    return store().all()
 
 
 def save_tasks(tasks: List[Dict]) -> None:
     """Write tasks list to DB_FILE."""
-    # TODO: implement
+    store().replace_all(tasks)
 
 
 def add_task(description: str) -> None:
     """Add new task with 'description'."""
-    # TODO: implement
-
-
-def list_tasks() -> None:
-    """Print tasks with index and status."""
-    # TODO: implement
+    number = store().add(description)
+    print(f"Added task {number}: {description}")
+
+
+def list_tasks(page: Optional[int] = None) -> None:
+    """Print tasks with index and status (one PAGE_SIZE page if `page` is given)."""
+    start, stop = 1, None
+    if page is not None:
+        start = (page - 1) * PAGE_SIZE + 1
+        stop = start + PAGE_SIZE
+
+    printed = 0
+    while stop is None or start < stop:
+        count = PAGE_SIZE if stop is None else stop - start
+        tasks = store().page(start, count)
+        for number, task in tasks:
+            mark = "x" if task.get("done") else " "
+            print(f"{number:>4}. [{mark}] {task['description']}")
+        printed += len(tasks)
+        if len(tasks) < count:
+            break
+        start += count
+    if not printed:
+        print("No tasks.")
 
 
 def mark_done(index: int) -> None:
     """Set task at index (1‑based) as done."""
-    # TODO: implement
+    if store().mark_done(index):
+        print(f"Task {index} done.")
+    else:
+        print(f"No task {index}.")
 
 
 def main(argv: List[str]) -> None:
     if len(argv) < 2:
-        print("Usage: python todo.py [add|list|done] ...")
+        print("Usage: python todo.py [add|list|done|daemon|stop] ...")
         return
 
     cmd = argv[1]
     if cmd == "add":
         add_task(" ".join(argv[2:]))
     elif cmd == "list":
-        list_tasks()
+        if len(argv) > 2 and not argv[2].isdigit():
+            print("Page must be a number.")
+            return
+        list_tasks(int(argv[2]) if len(argv) > 2 else None)
     elif cmd == "done":
         if len(argv) < 3 or not argv[2].isdigit():
             print("Provide task number.")
             return
         mark_done(int(argv[2]))
+    elif cmd == "daemon":
+        run_daemon()
+    elif cmd == "stop":
+        print("No daemon running.")
     else:
         print(f"Unknown command: {cmd}")
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] != "daemon":
+        try:
+            output = send_to_daemon(sys.argv[1:])
+        except OSError as exc:
+            sys.exit(f"The daemon did not answer: {exc}")
+        if output is not None:
+            sys.stdout.write(output)
+            sys.exit(0)
     main(sys.argv)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Pages-per-second benchmark: sequential requests vs the async paginated
+fetcher, both against a local stub of the /posts endpoint.
+
+Usage: python benchmark_fetch.py [pages]
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from main import count_by_user, count_by_user_paginated
+
+PAGE_COUNT = 500
+PAGE_SIZE = 10
+SERVER_DELAY = 0.02
+USERS = 10
+
+
+class StubPosts(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    total = PAGE_COUNT * PAGE_SIZE
+
+    def do_GET(self):
+        time.sleep(SERVER_DELAY)
+        query = parse_qs(urlsplit(self.path).query)
+        page = int(query.get("_page", ["1"])[0])
+        limit = int(query.get("_limit", [str(self.total)])[0])
+        start = (page - 1) * limit
+        posts = [{"userId": i % USERS + 1, "id": i + 1, "title": f"post {i}"}
+                 for i in range(start, min(start + limit, self.total))]
+        body = json.dumps(posts).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("X-Total-Count", str(self.total))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def sequential(url: str, pages: int) -> dict:
+    counts = {}
+    with requests.Session() as session:
+        for page in range(1, pages + 1):
+            response = session.get(url, params={"_page": page, "_limit": PAGE_SIZE})
+            for user_id, count in count_by_user(response.json()).items():
+                counts[user_id] = counts.get(user_id, 0) + count
+    return counts
+
+
+def main() -> None:
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else PAGE_COUNT
+    StubPosts.total = pages * PAGE_SIZE
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubPosts)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/posts"
+    print(f"{pages} pages of {PAGE_SIZE} posts, {SERVER_DELAY * 1000:.0f} ms server delay\n")
+
+    start = time.perf_counter()
+    expected = sequential(url, pages)
+    elapsed = time.perf_counter() - start
+    print(f"{'sequential (keep-alive)':<26} {elapsed:6.2f} s  {pages / elapsed:8.1f} pages/s")
+
+    for concurrency in (4, 16, 64):
+        start = time.perf_counter()
+        counts = asyncio.run(count_by_user_paginated(url, PAGE_SIZE, concurrency))
+        elapsed = time.perf_counter() - start
+        assert counts == expected
+        print(f"{f'async, {concurrency} in flight':<26} {elapsed:6.2f} s  {pages / elapsed:8.1f} pages/s")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
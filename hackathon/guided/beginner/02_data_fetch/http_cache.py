@@ -0,0 +1,303 @@
+"""
+On-disk HTTP response cache.
+
+Response bodies live in a content-addressed store (objects/<sha256>),
+so identical payloads are kept once. A small SQLite index maps each
+request key (method, URL with params) to its status, headers, body hash
+and freshness. Fresh entries are served without touching the network,
+stale ones are revalidated with ETag/Last-Modified, and the least
+recently used entries are evicted once the store exceeds max_bytes.
+
+Set HTTP_CACHE_OFFLINE=1 (or offline=True) to serve only from the cache.
+
+    session = CachedSession()
+    session.get("https://jsonplaceholder.typicode.com/posts").json()
+"""
+
+from __future__ import annotations
+import email.utils
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_DIR = Path(__file__).with_name(".http_cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL: Optional[float] = None  # no caching headers: don't treat as fresh
+CACHEABLE_METHODS = ("GET", "HEAD")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_by_access ON entries(last_access);
+CREATE INDEX IF NOT EXISTS entries_by_digest ON entries(digest);
+"""
+
+
+class OfflineMiss(LookupError):
+    """Raised in offline mode when a request has no cached response."""
+
+
+@dataclass
+class CachedEntry:
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    expires: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = CaseInsensitiveDict(self.headers)
+        validators = {}
+        if "ETag" in headers:
+            validators["If-None-Match"] = headers["ETag"]
+        if "Last-Modified" in headers:
+            validators["If-Modified-Since"] = headers["Last-Modified"]
+        return validators
+
+
+def cache_key(method: str, url: str, params: Optional[Mapping] = None) -> str:
+    """Stable key for a request; query params are sorted so their order doesn't matter."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query += [(name, str(value)) for name, value in params.items()]
+    url = urlunsplit(parts._replace(query=urlencode(sorted(query))))
+    return hashlib.sha256(f"{method.upper()} {url}".encode()).hexdigest()
+
+
+def freshness_lifetime(headers: Mapping[str, str],
+                       default_ttl: Optional[float]) -> Optional[float]:
+    """
+    Seconds a response may be served without revalidation, or None to not store it.
+
+    Without Cache-Control or Expires the response gets default_ttl. With
+    the default (None) it is only stored if it has a validator (ETag or
+    Last-Modified), and then always revalidated before reuse.
+    """
+    headers = CaseInsensitiveDict(headers)
+    directives = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name, "").isdigit():
+            return float(directives[name])
+
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(expires).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return 0.0
+    if default_ttl is not None:
+        return default_ttl
+    if "ETag" in headers or "Last-Modified" in headers:
+        return 0.0
+    return None
+
+
+class HttpCache:
+    """Content-addressed response store with an LRU size budget."""
+
+    def __init__(self, directory: Path = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 default_ttl: Optional[float] = DEFAULT_TTL, offline: Optional[bool] = None):
+        self.directory = Path(directory)
+        self.objects = self.directory / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.offline = os.environ.get("HTTP_CACHE_OFFLINE") == "1" if offline is None else offline
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.directory / "index.sqlite3", check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._size = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM entries)"
+        ).fetchone()[0]
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest
+
+    def get(self, key: str) -> Optional[CachedEntry]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, status, headers, digest, expires FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            url, status, headers, digest, expires = row
+            try:
+                body = self._object_path(digest).read_bytes()
+            except FileNotFoundError:
+                size = self._db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()[0]
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._release(digest, size)
+                return None
+            self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+        return CachedEntry(url, status, json.loads(headers), body, expires)
+
+    def put(self, key: str, url: str, status: int, headers: Mapping[str, str], body: bytes) -> bool:
+        """Store a response unless freshness_lifetime() rules it out; returns whether it was stored."""
+        lifetime = freshness_lifetime(headers, self.default_ttl)
+        if lifetime is None or len(body) > self.max_bytes:
+            return False
+
+        digest = hashlib.sha256(body).hexdigest()
+        now = time.time()
+        with self._lock:
+            if not self._referenced(digest):
+                path = self._object_path(digest)
+                path.parent.mkdir(exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(body)
+                os.replace(tmp, path)
+                self._size += len(body)
+            previous = self._db.execute(
+                "SELECT digest, size FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, status, json.dumps(dict(headers)), digest, len(body), now + lifetime, now)
+            )
+            if previous is not None and previous[0] != digest:
+                self._release(*previous)
+            self._evict()
+        return True
+
+    def refresh(self, key: str, headers: Mapping[str, str]) -> None:
+        """Apply a 304's headers: merge them in and restart the freshness clock."""
+        with self._lock:
+            row = self._db.execute("SELECT headers FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return
+            merged = CaseInsensitiveDict(json.loads(row[0]))
+            merged.update(headers)
+            lifetime = freshness_lifetime(merged, self.default_ttl) or 0.0
+            now = time.time()
+            self._db.execute(
+                "UPDATE entries SET headers = ?, expires = ?, last_access = ? WHERE key = ?",
+                (json.dumps(dict(merged)), now + lifetime, now, key)
+            )
+
+    def size(self) -> int:
+        """Bytes held in the object store (shared bodies counted once)."""
+        return self._size
+
+    def _referenced(self, digest: str) -> bool:
+        return self._db.execute(
+            "SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)
+        ).fetchone() is not None
+
+    def _release(self, digest: str, size: int) -> None:
+        """Delete a body once no entry points at it."""
+        if not self._referenced(digest):
+            self._object_path(digest).unlink(missing_ok=True)
+            self._size -= size
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes:
+            row = self._db.execute(
+                "SELECT key, digest, size FROM entries ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if row is None:
+                self._size = 0  # drifted (e.g. bodies removed behind our back)
+                return
+            key, digest, size = row
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._release(digest, size)
+
+    def clear(self) -> None:
+        with self._lock:
+            digests = [row[0] for row in self._db.execute("SELECT DISTINCT digest FROM entries")]
+            self._db.execute("DELETE FROM entries")
+            self._size = 0
+        for digest in digests:
+            self._object_path(digest).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def _as_response(entry: CachedEntry, request: requests.PreparedRequest) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry.status
+    response.headers = CaseInsensitiveDict(entry.headers)
+    response._content = entry.body
+    response._content_consumed = True  # so iter_content() slices _content, not raw
+    response.url = entry.url
+    response.request = request
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.from_cache = True
+    return response
+
+
+class CachedSession(requests.Session):
+    """
+    requests.Session that answers GET/HEAD from an HttpCache.
+
+    Drop-in replacement: session.get(url, params=...) works as usual, and
+    responses carry a `from_cache` attribute.
+    """
+
+    def __init__(self, cache: Optional[HttpCache] = None, **cache_options):
+        super().__init__()
+        self.cache = cache or HttpCache(**cache_options)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if request.method not in CACHEABLE_METHODS:
+            return super().send(request, **kwargs)
+
+        # PreparedRequest.url already carries the encoded params
+        key = cache_key(request.method, request.url)
+        entry = self.cache.get(key)
+        if entry is not None and (entry.fresh or self.cache.offline):
+            return _as_response(entry, request)
+        if self.cache.offline:
+            raise OfflineMiss(f"{request.method} {request.url} is not cached")
+
+        if entry is not None:
+            request.headers.update(entry.validators())
+        try:
+            response = super().send(request, **kwargs)
+        except requests.ConnectionError:
+            if entry is None:
+                raise
+            return _as_response(entry, request)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(key, response.headers)
+            return _as_response(entry, request)
+        if response.status_code == 200:
+            self.cache.put(key, response.url, response.status_code, response.headers, response.content)
+        response.from_cache = False
+        return response
@@ -3,27 +3,136 @@
 JSONPlaceholder analysis – who wrote the most posts?
 """
 
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import asyncio
+import heapq
+import json
+import sys
 import requests
 import collections
 
+from http_cache import CachedSession, HttpCache
+from paginated import DEFAULT_CONCURRENCY, PAGE_SIZE, fetch_pages
 
-def fetch_posts() -> List[Dict]:
-    """Return list of posts from JSONPlaceholder API."""
-    # TODO: implement
+API_URL = "https://jsonplaceholder.typicode.com/posts"
 
+_session: Optional[CachedSession] = None
 
-def count_by_user(posts: List[Dict]) -> dict[int, int]:
-    """Return a dict mapping userId to number of posts."""
-    # TODO: implement
 
+def default_session() -> CachedSession:
+    """The CachedSession shared by every fetch_posts() call without a session."""
+    global _session
+    if _session is None:
+        _session = CachedSession()
+    return _session
 
-def main() -> None:
-    posts = fetch_posts()
-    counts = count_by_user(posts)
-    user_id, total = max(counts.items(), key=lambda t: t[1])
+
+def fetch_posts(session: Optional[requests.Session] = None) -> List[Dict]:
+    """Return list of posts from JSONPlaceholder API (cached on disk by default)."""
+    session = session or default_session()
+    response = session.get(API_URL, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+def iter_jsonl(path: str) -> Iterator[Dict]:
+    """Yield one post per line of a JSON Lines file, skipping blank lines."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class PostCounter:
+    """
+    One-pass aggregation over a stream of posts.
+
+    Keeps the count per userId, the current leader and a top-k heap, so
+    memory is bounded by the number of distinct users, not posts. Counts
+    only grow, so a user can enter the top k only by passing its minimum.
+    Users are ranked by (count, -userId) everywhere: on equal counts the
+    lowest userId wins, whatever order the posts arrive in.
+    """
+
+    def __init__(self, k: int = 10):
+        self.k = k
+        self.counts: Dict[int, int] = {}
+        self.leader: Optional[Tuple[int, int]] = None
+        self._top: Dict[int, int] = {}
+        # (count, -userId) entries; ones no longer matching _top are stale
+        self._heap: List[Tuple[int, int]] = []
+
+    def add(self, post: Dict) -> None:
+        user_id = post["userId"]
+        count = self.counts.get(user_id, 0) + 1
+        self.counts[user_id] = count
+
+        rank = (count, -user_id)
+        if self.leader is None or rank > (self.leader[1], -self.leader[0]):
+            self.leader = (user_id, count)
+
+        if user_id in self._top or len(self._top) < self.k:
+            self._top[user_id] = count
+            heapq.heappush(self._heap, rank)
+        elif rank > self._min_top():
+            _, evicted = heapq.heappop(self._heap)
+            del self._top[-evicted]
+            self._top[user_id] = count
+            heapq.heappush(self._heap, rank)
+
+        if len(self._heap) > 4 * self.k + 64:
+            self._heap = [(c, -u) for u, c in self._top.items()]
+            heapq.heapify(self._heap)
+
+    def _min_top(self) -> Tuple[int, int]:
+        """Lowest-ranked (count, -userId) in the top k, dropping stale entries."""
+        while self._top.get(-self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0]
+
+    def update(self, posts: Iterable[Dict]) -> "PostCounter":
+        for post in posts:
+            self.add(post)
+        return self
+
+    def top(self) -> List[Tuple[int, int]]:
+        """(userId, count) for the k most prolific users, highest first."""
+        return sorted(self._top.items(), key=lambda t: (-t[1], t[0]))
+
+
+def count_by_user(posts: Iterable[Dict]) -> dict[int, int]:
+    """Return a dict mapping userId to number of posts (consumes any iterable once)."""
+    return dict(collections.Counter(post["userId"] for post in posts))
+
+
+async def count_by_user_paginated(url: str = API_URL, page_size: int = PAGE_SIZE,
+                                  concurrency: int = DEFAULT_CONCURRENCY,
+                                  counter: Optional[PostCounter] = None,
+                                  cache: Optional[HttpCache] = None) -> dict[int, int]:
+    """Fetch `url` page by page and count each page while the next ones download."""
+    counter = counter if counter is not None else PostCounter(k=1)
+    async for page in fetch_pages(url, page_size, concurrency, cache=cache):
+        counter.update(page)
+    return counter.counts
+
+
+def main(argv: List[str]) -> None:
+    if len(argv) > 1:
+        # Stream a JSON Lines dump instead of calling the API
+        counter = PostCounter().update(iter_jsonl(argv[1]))
+    else:
+        counter = PostCounter()
+        cache = HttpCache()
+        try:
+            asyncio.run(count_by_user_paginated(counter=counter, cache=cache))
+        finally:
+            cache.close()
+    if counter.leader is None:
+        print("No posts found.")
+        return
+    user_id, total = counter.leader
     print(f"User {user_id} wrote {total} posts.")
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv)
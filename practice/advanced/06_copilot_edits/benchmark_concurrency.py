@@ -0,0 +1,80 @@
+"""
+Concurrency stress benchmark for the views stores
+Hammers create_order from many threads and checks nothing is oversold
+"""
+
+import random
+import sys
+import threading
+import time
+
+import views
+
+PRODUCT_COUNT = 200
+INITIAL_STOCK = 500
+ORDERS_PER_THREAD = 5000
+
+
+def reset_stores():
+    for product_id in list(views.products):
+        views.delete_product(product_id)
+    views.orders.clear()
+    for i in range(PRODUCT_COUNT):
+        views.create_product({'name': f"Product {i}", 'price': 10.0, 'stock': INITIAL_STOCK})
+
+
+def place_orders(seed, count, rejected):
+    rng = random.Random(seed)
+    product_ids = list(views.products)
+    for _ in range(count):
+        basket = [
+            {'product_id': rng.choice(product_ids), 'quantity': rng.randint(1, 3)}
+            for _ in range(rng.randint(1, 4))
+        ]
+        try:
+            views.create_order({'customer_name': 'stress', 'items': basket})
+        except ValueError:
+            rejected.append(1)
+
+
+def check_no_oversell():
+    ordered = {}
+    for order in views.orders.values():
+        for item in order.items:
+            ordered[item['product_id']] = ordered.get(item['product_id'], 0) + item['quantity']
+
+    for product in views.products.values():
+        assert product.stock >= 0, f"negative stock for product {product.id}"
+        assert product.stock + ordered.get(product.id, 0) == INITIAL_STOCK, \
+            f"stock mismatch for product {product.id}"
+
+
+def run(thread_count):
+    reset_stores()
+    rejected = []
+    threads = [
+        threading.Thread(target=place_orders, args=(seed, ORDERS_PER_THREAD, rejected))
+        for seed in range(thread_count)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    check_no_oversell()
+    attempts = thread_count * ORDERS_PER_THREAD
+    print(f"{thread_count:>3} threads: {attempts / elapsed:>10,.0f} orders/s "
+          f"({len(views.orders):,} placed, {len(rejected):,} rejected, no oversell)")
+
+
+def main():
+    thread_counts = [int(arg) for arg in sys.argv[1:]] or [1, 2, 4, 8, 16]
+    for thread_count in thread_counts:
+        run(thread_count)
+
+
+if __name__ == "__main__":
+    main()
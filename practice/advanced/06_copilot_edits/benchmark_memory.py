@@ -0,0 +1,57 @@
+"""
+Memory benchmark for order line storage
+Compares one dict per order line against the columnar OrderLines store
+"""
+
+import sys
+import tracemalloc
+
+from models import OrderLines
+
+LINE_COUNT = 1_000_000
+PRODUCT_NAMES = [f"Product {i}" for i in range(1000)]
+
+
+def make_line(i):
+    return {
+        'product_id': i % 1000 + 1,
+        'name': PRODUCT_NAMES[i % 1000],
+        'price': 9.99 + i % 50,
+        'quantity': i % 5 + 1
+    }
+
+
+def measure(build, count):
+    tracemalloc.start()
+    lines = build(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del lines
+    return current
+
+
+def build_dicts(count):
+    return [make_line(i) for i in range(count)]
+
+
+def build_columnar(count):
+    lines = OrderLines()
+    for i in range(count):
+        lines.append(make_line(i))
+    return lines
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else LINE_COUNT
+
+    before = measure(build_dicts, count)
+    after = measure(build_columnar, count)
+
+    print(f"Order lines:          {count:,}")
+    print(f"list of dicts:        {before / count:.1f} bytes/line")
+    print(f"OrderLines (arrays):  {after / count:.1f} bytes/line")
+    print(f"Reduction:            {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
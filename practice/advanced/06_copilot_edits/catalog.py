@@ -0,0 +1,292 @@
+"""
+Product search indexes for e-commerce application
+Practice file for Copilot Edits exercises
+"""
+
+import bisect
+import functools
+import re
+import threading
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def synchronized(method):
+    """Run a method while holding the instance's lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class ProductCatalog:
+    """Inverted n-gram index over product names.
+
+    Matches the semantics of utils.search_products (case-insensitive
+    substring match) but only touches the posting lists for the query,
+    and is kept current by add/update/remove instead of rescanning.
+
+    Each name is indexed by the gram_size characters starting at every
+    position (shorter at the end of the name), so a query of up to
+    gram_size characters is a prefix scan over the sorted grams.
+    """
+
+    def __init__(self, gram_size=3):
+        self.gram_size = gram_size
+        self._lock = threading.RLock()
+        self._products = {}
+        self._names = {}
+        self._grams = {}
+        self._sorted_grams = []
+        self._tokens = {}
+        self._sorted_tokens = []
+        self._pending = None
+
+    @synchronized
+    def __len__(self):
+        self._build_pending()
+        return len(self._products)
+
+    def _grams_for(self, name):
+        return {name[start:start + self.gram_size] for start in range(len(name))}
+
+    @synchronized
+    def add(self, product):
+        """Index a product by its current name"""
+        self._build_pending()
+        if product.id in self._products:
+            self.remove(product.id)
+
+        name = product.name.lower()
+        self._products[product.id] = product
+        self._names[product.id] = name
+
+        for gram in self._grams_for(name):
+            if gram not in self._grams:
+                self._grams[gram] = set()
+                bisect.insort(self._sorted_grams, gram)
+            self._grams[gram].add(product.id)
+
+        for token in set(TOKEN_PATTERN.findall(name)):
+            if token not in self._tokens:
+                self._tokens[token] = set()
+                bisect.insort(self._sorted_tokens, token)
+            self._tokens[token].add(product.id)
+
+    @synchronized
+    def load(self, products):
+        """Replace the index contents with a bulk set of products.
+
+        Indexing is deferred to the first call that needs it, so a cold
+        start does not pay for the n-gram build up front.
+        """
+        self._products = {}
+        self._names = {}
+        self._grams = {}
+        self._sorted_grams = []
+        self._tokens = {}
+        self._sorted_tokens = []
+        self._pending = list(products)
+
+    def _build_pending(self):
+        if not self._pending:
+            return
+
+        for product in self._pending:
+            name = product.name.lower()
+            self._products[product.id] = product
+            self._names[product.id] = name
+            for gram in self._grams_for(name):
+                self._grams.setdefault(gram, set()).add(product.id)
+            for token in TOKEN_PATTERN.findall(name):
+                self._tokens.setdefault(token, set()).add(product.id)
+
+        self._sorted_grams = sorted(self._grams)
+        self._sorted_tokens = sorted(self._tokens)
+        self._pending = None
+
+    @synchronized
+    def remove(self, product_id):
+        """Drop a product from the index"""
+        self._build_pending()
+        if product_id not in self._products:
+            return False
+
+        name = self._names.pop(product_id)
+        del self._products[product_id]
+
+        for gram in self._grams_for(name):
+            postings = self._grams[gram]
+            postings.discard(product_id)
+            if not postings:
+                del self._grams[gram]
+                index = bisect.bisect_left(self._sorted_grams, gram)
+                del self._sorted_grams[index]
+
+        for token in set(TOKEN_PATTERN.findall(name)):
+            postings = self._tokens[token]
+            postings.discard(product_id)
+            if not postings:
+                del self._tokens[token]
+                index = bisect.bisect_left(self._sorted_tokens, token)
+                del self._sorted_tokens[index]
+
+        return True
+
+    @synchronized
+    def update(self, product):
+        """Re-index a product after its name changed"""
+        self.add(product)
+
+    def _results(self, product_ids):
+        return [self._products[product_id] for product_id in sorted(product_ids)]
+
+    @staticmethod
+    def _prefix_matches(sorted_keys, postings, prefix):
+        """Union of the postings for every key starting with prefix"""
+        matches = set()
+        index = bisect.bisect_left(sorted_keys, prefix)
+
+        while index < len(sorted_keys):
+            key = sorted_keys[index]
+            if not key.startswith(prefix):
+                break
+            matches |= postings[key]
+            index += 1
+
+        return matches
+
+    @synchronized
+    def search(self, query):
+        """Search products whose name contains query (case-insensitive)"""
+        self._build_pending()
+        query = query.lower()
+        if not query:
+            return self._results(self._products)
+
+        if len(query) == self.gram_size:
+            return self._results(self._grams.get(query, ()))
+        if len(query) < self.gram_size:
+            return self._results(self._prefix_matches(self._sorted_grams, self._grams, query))
+
+        postings = []
+        for start in range(len(query) - self.gram_size + 1):
+            gram = query[start:start + self.gram_size]
+            if gram not in self._grams:
+                return []
+            postings.append(self._grams[gram])
+
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for other in postings[1:]:
+            candidates &= other
+            if not candidates:
+                return []
+
+        return self._results(
+            product_id for product_id in candidates
+            if query in self._names[product_id]
+        )
+
+    @synchronized
+    def search_prefix(self, prefix):
+        """Search products with a name word starting with prefix"""
+        self._build_pending()
+        prefix = prefix.lower()
+        return self._results(self._prefix_matches(self._sorted_tokens, self._tokens, prefix))
+
+
+class PriceIndex:
+    """Sorted (price, id) index over products.
+
+    Replaces the full sort in utils.sort_products_by_price with a list
+    kept in order via bisect, so range, top-k and page queries only
+    touch the slice they return.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._products = {}
+        self._prices = {}
+        self._keys = []
+
+    def __len__(self):
+        return len(self._keys)
+
+    @synchronized
+    def add(self, product):
+        """Index a product at its current price"""
+        if product.id in self._products:
+            self.remove(product.id)
+
+        self._products[product.id] = product
+        self._prices[product.id] = product.price
+        bisect.insort(self._keys, (product.price, product.id))
+
+    @synchronized
+    def load(self, products):
+        """Rebuild the index from scratch with a single sort"""
+        self._products = {product.id: product for product in products}
+        self._prices = {product.id: product.price for product in self._products.values()}
+        self._keys = sorted((price, product_id) for product_id, price in self._prices.items())
+
+    @synchronized
+    def remove(self, product_id):
+        """Drop a product from the index"""
+        if product_id not in self._products:
+            return False
+
+        key = (self._prices.pop(product_id), product_id)
+        del self._products[product_id]
+        index = bisect.bisect_left(self._keys, key)
+        del self._keys[index]
+        return True
+
+    @synchronized
+    def update(self, product):
+        """Move a product after its price changed"""
+        if self._prices.get(product.id) != product.price:
+            self.add(product)
+
+    def _results(self, keys):
+        return [self._products[product_id] for _, product_id in keys]
+
+    @synchronized
+    def price_range(self, min_price=None, max_price=None):
+        """Products with min_price <= price <= max_price, cheapest first"""
+        start = 0
+        end = len(self._keys)
+        if min_price is not None:
+            start = bisect.bisect_left(self._keys, (min_price,))
+        if max_price is not None:
+            end = bisect.bisect_left(self._keys, (max_price, float('inf')))
+        return self._results(self._keys[start:end])
+
+    @synchronized
+    def cheapest(self, k):
+        """The k cheapest products"""
+        return self._results(self._keys[:k])
+
+    @synchronized
+    def most_expensive(self, k):
+        """The k most expensive products, most expensive first"""
+        if k <= 0:
+            return []
+        return self._results(reversed(self._keys[-k:]))
+
+    @synchronized
+    def page(self, page=1, page_size=20, descending=False):
+        """One page of products ordered by price"""
+        if page < 1 or page_size < 1:
+            raise ValueError("page and page_size must be positive")
+
+        start = (page - 1) * page_size
+        if descending:
+            end = len(self._keys) - start
+            return self._results(reversed(self._keys[max(end - page_size, 0):max(end, 0)]))
+        return self._results(self._keys[start:start + page_size])
+
+    @synchronized
+    def __iter__(self):
+        return iter(self._results(self._keys))
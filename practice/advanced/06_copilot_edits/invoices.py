@@ -0,0 +1,90 @@
+"""
+Batch invoice generation for e-commerce application
+Practice file for Copilot Edits exercises
+"""
+
+import csv
+import itertools
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import calculate_tax, format_price, generate_order_number
+
+CSV_FIELDS = ['order_number', 'customer_name', 'items', 'subtotal', 'tax', 'total']
+
+
+def _chunks(orders, chunk_size):
+    orders = iter(orders)
+    while True:
+        chunk = list(itertools.islice(orders, chunk_size))
+        if not chunk:
+            return
+        # Plain tuples and item dicts keep process-pool payloads small: the
+        # OrderLines view would pickle its owning Order and Customer graph
+        yield [(order.id, order.customer_name, order.calculate_total(), list(order.items))
+               for order in chunk]
+
+
+def _invoice_chunk(chunk, tax_rate):
+    """Build invoice records for one chunk of (id, name, subtotal, items)"""
+    invoices = []
+    for order_id, customer_name, subtotal, items in chunk:
+        tax = calculate_tax(subtotal, tax_rate)
+        invoices.append({
+            'order_number': generate_order_number(order_id),
+            'customer_name': customer_name,
+            'items': items,
+            'subtotal': format_price(subtotal),
+            'tax': format_price(tax),
+            'total': format_price(subtotal + tax)
+        })
+    return invoices
+
+
+def generate_invoices(orders, tax_rate=0.1, chunk_size=1000, workers=None):
+    """Yield invoice data for each order in an iterable of orders.
+
+    Orders are processed chunk_size at a time, so only a bounded number of
+    invoices is held in memory. Pass workers to fan chunks out to a
+    process pool; results are still yielded in input order.
+    """
+    if tax_rate < 0 or tax_rate > 1:
+        raise ValueError("Tax rate must be between 0 and 1")
+
+    chunks = _chunks(orders, chunk_size)
+    if not workers:
+        for chunk in chunks:
+            yield from _invoice_chunk(chunk, tax_rate)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_invoice_chunk, chunk, tax_rate))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_invoices_jsonl(orders, fp, **options):
+    """Stream invoices to a text file as JSON Lines, returning the count"""
+    count = 0
+    for invoice in generate_invoices(orders, **options):
+        fp.write(json.dumps(invoice))
+        fp.write("\n")
+        count += 1
+    return count
+
+
+def write_invoices_csv(orders, fp, **options):
+    """Stream invoices to a text file as CSV, returning the count"""
+    writer = csv.DictWriter(fp, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    count = 0
+    for invoice in generate_invoices(orders, **options):
+        invoice['items'] = json.dumps(invoice['items'])
+        writer.writerow(invoice)
+        count += 1
+    return count
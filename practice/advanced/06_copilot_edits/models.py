@@ -3,7 +3,13 @@ E-commerce data models
 Practice file for Copilot Edits exercises
 """
 
+from array import array
+from collections.abc import MutableSequence
+
+
 class Product:
+    __slots__ = ('id', 'name', 'price', 'stock')
+
     def __init__(self, id, name, price, stock):
         self.id = id
         self.name = name
@@ -22,18 +28,181 @@ class Product:
         return self.price * (1 + tax_rate)
 
 
+# Python type each typed column holds exactly, by array typecode
+_ARRAY_TYPES = {'q': int, 'd': float}
+
+
+class OrderLines(MutableSequence):
+    """Columnar storage for order lines.
+
+    product_id, price and quantity live in typed arrays rather than one
+    dict per line; indexing and iteration still yield the familiar
+    {'product_id', 'name', 'price', 'quantity'} dicts. A value the array
+    would not return unchanged (an id like 'sku-1', an int or Decimal
+    price, a fractional quantity, an int beyond 64 bits) switches that
+    column to a plain list, so every value comes back as it was given.
+    Use list(lines) where a real list is needed, e.g. for json.dumps.
+
+    on_change, if set, is called after every mutation with the amount an
+    append added to the subtotal, or with None when the subtotal has to
+    be recomputed (see Order).
+    """
+
+    __slots__ = ('product_ids', 'names', 'prices', 'quantities', 'on_change')
+
+    def __init__(self, items=()):
+        self.product_ids = array('q')
+        self.names = []
+        self.prices = array('d')
+        self.quantities = array('q')
+        self.on_change = None
+        for item in items:
+            self.append(item)
+
+    @classmethod
+    def from_columns(cls, product_ids, names, prices, quantities):
+        """Build order lines directly from column sequences"""
+        lines = cls()
+        for name, values in (('product_ids', product_ids), ('prices', prices),
+                             ('quantities', quantities)):
+            values = list(values)
+            column = getattr(lines, name)
+            if all(type(value) is _ARRAY_TYPES[column.typecode] for value in values):
+                try:
+                    column.extend(values)
+                    continue
+                except OverflowError:
+                    pass
+            setattr(lines, name, values)
+        lines.names.extend(names)
+        return lines
+
+    def __len__(self):
+        return len(self.product_ids)
+
+    def _untyped(self, name):
+        column = getattr(self, name)
+        if isinstance(column, array):
+            column = list(column)
+            setattr(self, name, column)
+        return column
+
+    def _store(self, name, index, value, insert=False):
+        """Set or insert value in a column, untyping it if the array can't hold it"""
+        column = getattr(self, name)
+        if isinstance(column, array) and type(value) is not _ARRAY_TYPES[column.typecode]:
+            column = self._untyped(name)
+        try:
+            self._put(column, index, value, insert)
+        except OverflowError:
+            self._put(self._untyped(name), index, value, insert)
+
+    @staticmethod
+    def _put(column, index, value, insert):
+        if insert:
+            column.insert(index, value)
+        else:
+            column[index] = value
+
+    def _changed(self, appended=None):
+        if self.on_change is not None:
+            self.on_change(appended)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return {
+            'product_id': self.product_ids[index],
+            'name': self.names[index],
+            'price': self.prices[index],
+            'quantity': self.quantities[index]
+        }
+
+    def __setitem__(self, index, item):
+        if isinstance(index, slice):
+            raise TypeError("OrderLines does not support slice assignment")
+        self._store('product_ids', index, item['product_id'])
+        self.names[index] = item['name']
+        self._store('prices', index, item['price'])
+        self._store('quantities', index, item['quantity'])
+        self._changed()
+
+    def __delitem__(self, index):
+        del self.product_ids[index]
+        del self.names[index]
+        del self.prices[index]
+        del self.quantities[index]
+        self._changed()
+
+    def insert(self, index, item):
+        appending = index >= len(self)
+        self._store('product_ids', index, item['product_id'], insert=True)
+        self.names.insert(index, item['name'])
+        self._store('prices', index, item['price'], insert=True)
+        self._store('quantities', index, item['quantity'], insert=True)
+        # Read back the stored values so the total uses exactly what the
+        # columns hold
+        self._changed(self.prices[-1] * self.quantities[-1] if appending else None)
+
+    def __eq__(self, other):
+        if isinstance(other, (OrderLines, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"OrderLines({list(self)!r})"
+
+    def subtotal(self):
+        return sum(price * quantity for price, quantity in zip(self.prices, self.quantities))
+
+
 class Order:
+    __slots__ = ('id', 'customer_name', '_items', 'status', 'customer', '_total')
+
     def __init__(self, id, customer_name, items):
         self.id = id
         self.customer_name = customer_name
-        self.items = items
         self.status = "pending"
+        self.customer = None
+        self._items = None
+        self._total = 0
+        self.items = items
+
+    @property
+    def items(self):
+        return self._items
+
+    @items.setter
+    def items(self, items):
+        """Replace the order lines; the total follows them from then on"""
+        if not isinstance(items, OrderLines):
+            items = OrderLines(items)
+        if self._items is not None:
+            self._items.on_change = None
+        self._items = items
+        items.on_change = self._lines_changed
+        self._set_total(items.subtotal())
 
     def calculate_total(self):
-        total = 0
-        for item in self.items:
-            total += item['price'] * item['quantity']
-        return total
+        # Running subtotal, kept equal to items.subtotal() by _lines_changed
+        return self._total
+
+    def _lines_changed(self, appended):
+        """Appends add to the running total; any other change recomputes it.
+
+        Appending in order adds the same terms in the same order as
+        items.subtotal(), so the running total never drifts from it.
+        """
+        if appended is None:
+            self._set_total(self._items.subtotal())
+        else:
+            self._set_total(self._total + appended)
+
+    def _set_total(self, total):
+        amount = total - self._total
+        self._total = total
+        if self.status == "completed" and self.customer is not None:
+            self.customer._record_spend(amount)
 
     def add_item(self, product, quantity):
         if not product.is_available():
@@ -47,27 +216,48 @@ class Order:
         })
         product.update_stock(-quantity)
 
+    def remove_item(self, product):
+        """Undo add_item: drop the first line for product and restock it"""
+        try:
+            index = self.items.product_ids.index(product.id)
+        except ValueError:
+            return None
+
+        item = self.items[index]
+        del self.items[index]
+        product.update_stock(item['quantity'])
+        return item
+
     def complete_order(self):
-        self.status = "completed"
+        if self.status != "completed":
+            self.status = "completed"
+            if self.customer is not None:
+                self.customer._record_spend(self._total)
         return True
 
 
 class Customer:
+    __slots__ = ('id', 'name', 'email', 'orders', '_total_spent')
+
     def __init__(self, id, name, email):
         self.id = id
         self.name = name
         self.email = email
         self.orders = []
+        self._total_spent = 0
 
     def place_order(self, order):
         self.orders.append(order)
+        order.customer = self
+        if order.status == "completed":
+            self._record_spend(order.calculate_total())
+
+    def _record_spend(self, amount):
+        self._total_spent += amount
 
     def get_order_history(self):
         return [order for order in self.orders]
 
     def get_total_spent(self):
-        total = 0
-        for order in self.orders:
-            if order.status == "completed":
-                total += order.calculate_total()
-        return total
+        # Aggregate of completed orders, updated as orders complete
+        return self._total_spent
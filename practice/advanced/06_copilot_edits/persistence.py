@@ -0,0 +1,109 @@
+"""
+Write-ahead-logged persistence for e-commerce application
+Practice file for Copilot Edits exercises
+"""
+
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+# Each log record is framed as <payload length><crc32 of payload><payload>
+RECORD_HEADER = struct.Struct('<II')
+
+
+class WriteAheadLog:
+    """Append-only binary log plus periodically compacted snapshots.
+
+    Records are pickled tuples; the log holds everything written since
+    the last snapshot. Recovery loads the snapshot and replays the log,
+    dropping a torn or corrupt tail left by a crash mid-write. Callers
+    should write records that are idempotent upserts, so replaying one
+    that is already reflected in the snapshot is harmless.
+    """
+
+    def __init__(self, directory, compact_every=100_000, sync=False):
+        os.makedirs(directory, exist_ok=True)
+        self.log_path = os.path.join(directory, 'wal.log')
+        self.snapshot_path = os.path.join(directory, 'snapshot.bin')
+        self.compact_every = compact_every
+        self.sync = sync
+        self.records_since_snapshot = 0
+        self.payload_bytes = 0
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+        self._file = open(self.log_path, 'ab')
+
+    def append(self, record):
+        """Append one record to the log.
+
+        The record is flushed to the OS, which survives a process crash;
+        it is only fsynced (surviving power loss) when sync=True.
+        """
+        payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        header = RECORD_HEADER.pack(len(payload), zlib.crc32(payload))
+
+        with self._lock:
+            self._file.write(header + payload)
+            self._file.flush()
+            if self.sync:
+                os.fsync(self._file.fileno())
+            self.records_since_snapshot += 1
+            self.payload_bytes += len(payload)
+            self.bytes_written += RECORD_HEADER.size + len(payload)
+
+    def needs_compaction(self):
+        return self.records_since_snapshot >= self.compact_every
+
+    def compact(self, get_state):
+        """Write get_state() as the new snapshot and truncate the log.
+
+        get_state is called with the log lock held, so every record
+        appended before it has already been applied to the state it reads.
+        """
+        with self._lock:
+            state = get_state()
+            temp_path = self.snapshot_path + '.tmp'
+            with open(temp_path, 'wb') as snapshot:
+                pickle.dump(state, snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+                snapshot.flush()
+                os.fsync(snapshot.fileno())
+                self.bytes_written += snapshot.tell()
+            os.replace(temp_path, self.snapshot_path)
+
+            self._file.close()
+            self._file = open(self.log_path, 'wb')
+            self.records_since_snapshot = 0
+
+    def load_snapshot(self):
+        """Return the last snapshot state, or None if there is none"""
+        if not os.path.exists(self.snapshot_path):
+            return None
+        with open(self.snapshot_path, 'rb') as snapshot:
+            return pickle.load(snapshot)
+
+    def replay(self):
+        """Yield the records logged since the last snapshot"""
+        with open(self.log_path, 'rb') as log:
+            data = log.read()
+
+        offset = 0
+        while offset + RECORD_HEADER.size <= len(data):
+            length, checksum = RECORD_HEADER.unpack_from(data, offset)
+            start = offset + RECORD_HEADER.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            yield pickle.loads(payload)
+            offset = start + length
+            self.records_since_snapshot += 1
+
+        if offset < len(data):
+            # Drop the torn tail so new records are not appended after it
+            with self._lock:
+                self._file.truncate(offset)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,42 @@
+"""
+Bulk pricing functions for e-commerce application
+Practice file for Copilot Edits exercises
+
+NumPy counterparts of calculate_discount, calculate_tax and
+calculate_shipping in utils.py. Each takes arrays (or scalars, which
+broadcast), validates the whole batch once and returns an array. Use the
+scalar functions in utils.py for one-off calls.
+"""
+
+import numpy as np
+
+from utils import SHIPPING_BASE_RATE, SHIPPING_DISTANCE_RATE, SHIPPING_WEIGHT_RATE
+
+
+def calculate_discounts(prices, discount_percentages):
+    """Calculate discounted prices for a batch"""
+    prices = np.asarray(prices, dtype=np.float64)
+    discount_percentages = np.asarray(discount_percentages, dtype=np.float64)
+    if np.any((discount_percentages < 0) | (discount_percentages > 100)):
+        raise ValueError("Discount percentage must be between 0 and 100")
+
+    discount_amounts = prices * (discount_percentages / 100)
+    return prices - discount_amounts
+
+
+def calculate_taxes(amounts, tax_rates=0.1):
+    """Calculate tax amounts for a batch"""
+    amounts = np.asarray(amounts, dtype=np.float64)
+    tax_rates = np.asarray(tax_rates, dtype=np.float64)
+    if np.any((tax_rates < 0) | (tax_rates > 1)):
+        raise ValueError("Tax rate must be between 0 and 1")
+    return amounts * tax_rates
+
+
+def calculate_shipping_costs(weights, distances):
+    """Calculate shipping costs for a batch of weights and distances"""
+    weights = np.asarray(weights, dtype=np.float64)
+    distances = np.asarray(distances, dtype=np.float64)
+    return (SHIPPING_BASE_RATE
+            + (weights * SHIPPING_WEIGHT_RATE)
+            + (distances * SHIPPING_DISTANCE_RATE))
@@ -0,0 +1,94 @@
+"""
+Thread-safe in-memory storage for e-commerce application
+Practice file for Copilot Edits exercises
+"""
+
+import threading
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+
+
+class ConcurrentStore(MutableMapping):
+    """Dict-like store safe to share between request threads.
+
+    IDs come from a monotonic counter instead of len(store) + 1, so they
+    never collide after deletes. Keys are hashed onto a fixed set of lock
+    stripes: handlers lock only the keys they touch, and multi-key
+    operations take their stripes in sorted order to avoid deadlock.
+    """
+
+    def __init__(self, stripes=64):
+        self._data = {}
+        self._last_id = 0
+        self._id_lock = threading.Lock()
+        self._locks = [threading.RLock() for _ in range(stripes)]
+
+    def next_id(self):
+        """Allocate the next unused ID"""
+        with self._id_lock:
+            self._last_id += 1
+            return self._last_id
+
+    @property
+    def last_id(self):
+        """The most recently allocated ID"""
+        return self._last_id
+
+    def reset_ids(self, last_id):
+        """Continue ID allocation after last_id (e.g. after a reload)"""
+        with self._id_lock:
+            self._last_id = last_id
+
+    def _stripe(self, key):
+        return hash(key) % len(self._locks)
+
+    def lock_for(self, key):
+        """Lock guarding a single key"""
+        return self._locks[self._stripe(key)]
+
+    @contextmanager
+    def locked(self, keys):
+        """Hold the locks for all keys, acquired in stripe order"""
+        stripes = sorted({self._stripe(key) for key in keys})
+        for stripe in stripes:
+            self._locks[stripe].acquire()
+        try:
+            yield
+        finally:
+            for stripe in reversed(stripes):
+                self._locks[stripe].release()
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        with self.lock_for(key):
+            self._data[key] = value
+
+    def __delitem__(self, key):
+        with self.lock_for(key):
+            del self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        # Iterate over a snapshot so writers never break readers
+        return iter(list(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+    def load(self, data, last_id):
+        """Replace the contents in bulk, e.g. when recovering from disk"""
+        self._data = dict(data)
+        self.reset_ids(last_id)
+
+    def values(self):
+        return list(self._data.copy().values())
+
+    def items(self):
+        return list(self._data.copy().items())
@@ -0,0 +1,54 @@
+import pytest
+
+import views
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    views.open_persistence(tmp_path)
+    yield tmp_path
+    views.close_persistence()
+
+
+def reopen(directory, **options):
+    views.close_persistence()
+    views.open_persistence(directory, **options)
+
+
+def test_recovers_products_and_orders(store_dir):
+    product = views.create_product({'name': 'Lamp', 'price': 20.0, 'stock': 5})
+    order = views.create_order({'customer_name': 'Ada',
+                                'items': [{'product_id': product.id, 'quantity': 2}]})
+    views.complete_order(order.id)
+
+    reopen(store_dir)
+
+    assert views.get_product(product.id).stock == 3
+    recovered = views.get_order(order.id)
+    assert recovered.status == 'completed'
+    assert recovered.calculate_total() == pytest.approx(40.0)
+
+
+def test_compaction_on_order_record_keeps_the_order(tmp_path):
+    # compact_every=3: product, stock update, then the order record compacts
+    views.open_persistence(tmp_path, compact_every=3)
+    try:
+        product = views.create_product({'name': 'Lamp', 'price': 20.0, 'stock': 5})
+        order = views.create_order({'customer_name': 'Ada',
+                                    'items': [{'product_id': product.id, 'quantity': 2}]})
+        assert views.wal.records_since_snapshot == 0
+
+        reopen(tmp_path, compact_every=3)
+
+        assert views.get_product(product.id).stock == 3
+        assert views.get_order(order.id) is not None
+        assert views.get_order(order.id).calculate_total() == pytest.approx(40.0)
+    finally:
+        views.close_persistence()
+
+
+def test_open_twice_closes_the_previous_log(store_dir):
+    first = views.wal
+    views.open_persistence(store_dir)
+    assert first._file.closed
+    assert not views.wal._file.closed
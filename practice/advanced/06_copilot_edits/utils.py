@@ -3,6 +3,11 @@ Utility functions for e-commerce application
 Practice file for Copilot Edits exercises
 """
 
+SHIPPING_BASE_RATE = 5.0
+SHIPPING_WEIGHT_RATE = 0.5  # per kg
+SHIPPING_DISTANCE_RATE = 0.1  # per km
+
+
 def format_price(price):
     """Format price as currency"""
     return f"${price:.2f}"
@@ -42,11 +47,9 @@ def generate_order_number(order_id):
 
 def calculate_shipping(weight, distance):
     """Calculate shipping cost based on weight and distance"""
-    base_rate = 5.0
-    weight_rate = 0.5  # per kg
-    distance_rate = 0.1  # per km
-
-    shipping_cost = base_rate + (weight * weight_rate) + (distance * distance_rate)
+    shipping_cost = (SHIPPING_BASE_RATE
+                     + (weight * SHIPPING_WEIGHT_RATE)
+                     + (distance * SHIPPING_DISTANCE_RATE))
     return shipping_cost
 
 
@@ -66,7 +69,7 @@ def generate_invoice_data(order):
     return {
         'order_number': generate_order_number(order.id),
         'customer_name': order.customer_name,
-        'items': order.items,
+        'items': list(order.items),
         'subtotal': format_price(subtotal),
         'tax': format_price(tax),
         'total': format_price(total)
@@ -3,12 +3,120 @@ API endpoint handlers for e-commerce application
 Practice file for Copilot Edits exercises
 """
 
-from models import Product, Order, Customer
+from models import Product, Order, OrderLines, Customer
+from catalog import PriceIndex, ProductCatalog
+from persistence import WriteAheadLog
+from store import ConcurrentStore
 
 # In-memory storage (replace with database in production)
-products = {}
-orders = {}
-customers = {}
+products = ConcurrentStore()
+orders = ConcurrentStore()
+customers = ConcurrentStore()
+
+# Search indexes over products, kept in sync by the product handlers
+catalog = ProductCatalog()
+price_index = PriceIndex()
+
+# Optional write-ahead log that every change is written through
+wal = None
+
+
+def _product_record(product):
+    return ('product', product.id, product.name, product.price, product.stock)
+
+
+def _order_record(order):
+    lines = order.items
+    return ('order', order.id, order.customer_name, order.status,
+            lines.product_ids, lines.names, lines.prices, lines.quantities)
+
+
+def _persist(record):
+    """Log a change that has already been applied to the stores"""
+    if wal is None:
+        return
+    wal.append(record)
+    if wal.needs_compaction():
+        wal.compact(_snapshot_state)
+
+
+def _snapshot_state():
+    records = [_product_record(product) for product in products.values()]
+    records.extend(_order_record(order) for order in orders.values())
+    return {
+        'last_product_id': products.last_id,
+        'last_order_id': orders.last_id,
+        'records': records
+    }
+
+
+def _apply(record, product_map, order_map):
+    """Apply a logged record to plain product/order dicts (idempotent)"""
+    kind = record[0]
+    if kind == 'product':
+        _, product_id, name, price, stock = record
+        product_map[product_id] = Product(id=product_id, name=name, price=price, stock=stock)
+    elif kind == 'delete_product':
+        product_map.pop(record[1], None)
+    elif kind == 'order':
+        _, order_id, customer_name, status, *columns = record
+        order = Order(
+            id=order_id,
+            customer_name=customer_name,
+            items=OrderLines.from_columns(*columns)
+        )
+        order.status = status
+        order_map[order_id] = order
+    elif kind == 'order_status':
+        _, order_id, status = record
+        if order_id in order_map:
+            order_map[order_id].status = status
+    return record[1]
+
+
+def open_persistence(directory, **options):
+    """Recover the stores from directory and persist all further changes.
+
+    Loads the latest snapshot, replays the write-ahead log on top of it
+    and rebuilds the search indexes. options are passed to WriteAheadLog.
+    A log that is already open is closed first.
+    """
+    global wal
+    close_persistence()
+    log = WriteAheadLog(directory, **options)
+    product_map = {}
+    order_map = {}
+
+    last_product_id = last_order_id = 0
+    state = log.load_snapshot()
+    if state is not None:
+        last_product_id = state['last_product_id']
+        last_order_id = state['last_order_id']
+        for record in state['records']:
+            _apply(record, product_map, order_map)
+
+    for record in log.replay():
+        record_id = _apply(record, product_map, order_map)
+        if record[0] in ('product', 'delete_product'):
+            last_product_id = max(last_product_id, record_id)
+        else:
+            last_order_id = max(last_order_id, record_id)
+
+    products.load(product_map, last_product_id)
+    orders.load(order_map, last_order_id)
+    catalog.load(product_map.values())
+    price_index.load(product_map.values())
+    wal = log
+    return log
+
+
+def close_persistence():
+    """Stop writing changes through the write-ahead log"""
+    global wal
+    if wal is not None:
+        wal.close()
+        wal = None
+
 
 def get_products():
     """Get all products"""
@@ -17,86 +125,132 @@ def get_products():
 
 def get_product(product_id):
     """Get a specific product by ID"""
-    if product_id not in products:
-        return None
-    return products[product_id]
+    return products.get(product_id)
 
 
 def create_product(data):
     """Create a new product"""
-    product_id = len(products) + 1
+    product_id = products.next_id()
     product = Product(
         id=product_id,
         name=data['name'],
         price=data['price'],
         stock=data['stock']
     )
-    products[product_id] = product
+    with products.lock_for(product_id):
+        products[product_id] = product
+        catalog.add(product)
+        price_index.add(product)
+        _persist(_product_record(product))
     return product
 
 
 def update_product(product_id, data):
     """Update an existing product"""
-    if product_id not in products:
-        return None
+    with products.lock_for(product_id):
+        product = products.get(product_id)
+        if product is None:
+            return None
 
-    product = products[product_id]
-    if 'name' in data:
-        product.name = data['name']
-    if 'price' in data:
-        product.price = data['price']
-    if 'stock' in data:
-        product.stock = data['stock']
+        if 'name' in data:
+            product.name = data['name']
+            catalog.update(product)
+        if 'price' in data:
+            product.price = data['price']
+            price_index.update(product)
+        if 'stock' in data:
+            product.stock = data['stock']
+        _persist(_product_record(product))
 
     return product
 
 
 def delete_product(product_id):
     """Delete a product"""
-    if product_id not in products:
-        return False
-    del products[product_id]
+    with products.lock_for(product_id):
+        if product_id not in products:
+            return False
+        del products[product_id]
+        catalog.remove(product_id)
+        price_index.remove(product_id)
+        _persist(('delete_product', product_id))
     return True
 
 
+def search_products(query):
+    """Search products by name using the catalog index"""
+    return catalog.search(query)
+
+
+def get_products_by_price(page=1, page_size=20, descending=False):
+    """Get a page of products ordered by price"""
+    return price_index.page(page, page_size, descending)
+
+
+def get_products_in_price_range(min_price=None, max_price=None):
+    """Get products within a price range, cheapest first"""
+    return price_index.price_range(min_price, max_price)
+
+
 def create_order(data):
     """Create a new order"""
-    order_id = len(orders) + 1
+    order_id = orders.next_id()
     order = Order(
         id=order_id,
         customer_name=data['customer_name'],
         items=[]
     )
 
-    for item in data['items']:
-        product = get_product(item['product_id'])
-        if product:
-            order.add_item(product, item['quantity'])
+    # Reserve stock for the whole basket atomically: hold every product's
+    # lock, check all quantities, and only then decrement any of them.
+    with products.locked(item['product_id'] for item in data['items']):
+        requested = {}
+        for item in data['items']:
+            product = get_product(item['product_id'])
+            if product:
+                requested[product.id] = requested.get(product.id, 0) + item['quantity']
+
+        for product_id, quantity in requested.items():
+            product = products[product_id]
+            if not product.is_available():
+                raise ValueError("Product not available")
+            if product.stock < quantity:
+                raise ValueError("Insufficient stock")
+
+        for item in data['items']:
+            product = get_product(item['product_id'])
+            if product:
+                order.add_item(product, item['quantity'])
+
+        # Store before logging: a compaction triggered by these appends
+        # snapshots the stores, so they must already hold every change
+        orders[order_id] = order
+        for product_id in requested:
+            _persist(_product_record(products[product_id]))
+        _persist(_order_record(order))
 
-    orders[order_id] = order
     return order
 
 
 def get_order(order_id):
     """Get a specific order by ID"""
-    if order_id not in orders:
-        return None
-    return orders[order_id]
+    return orders.get(order_id)
 
 
 def get_customer_orders(customer_id):
     """Get all orders for a customer"""
-    if customer_id not in customers:
+    customer = customers.get(customer_id)
+    if customer is None:
         return []
-
-    customer = customers[customer_id]
     return customer.get_order_history()
 
 
 def complete_order(order_id):
     """Mark an order as completed"""
-    if order_id not in orders:
-        return False
-
-    order = orders[order_id]
-    return order.complete_order()
+    with orders.lock_for(order_id):
+        order = orders.get(order_id)
+        if order is None:
+            return False
+        completed = order.complete_order()
+        _persist(('order_status', order_id, order.status))
+        return completed
@@ -3,6 +3,11 @@
 # Exercise 1: Basic HTTP Requests
 
 import requests
+from http_cache import CachedSession
+
+# Repeat runs are served from .http_cache/ (set HTTP_CACHE_OFFLINE=1 to stay offline);
+# use session.get/session.post in place of requests.get/requests.post
+session = CachedSession()
 
 # 1. Make a GET request to httpbin.org/get
 
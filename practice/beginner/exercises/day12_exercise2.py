@@ -3,8 +3,13 @@
 # Exercise 2: Working with JSON Data
 
 import requests
+from http_cache import CachedSession
 import json
 
+# Repeat runs are served from .http_cache/ (set HTTP_CACHE_OFFLINE=1 to stay offline);
+# use session.get/session.post in place of requests.get/requests.post
+session = CachedSession()
+
 # 1. Parse JSON response from API
 
 
@@ -3,6 +3,11 @@
 # Exercise 3: Working with Real APIs
 
 import requests
+from http_cache import CachedSession
+
+# Repeat runs are served from .http_cache/ (set HTTP_CACHE_OFFLINE=1 to stay offline);
+# use session.get/session.post in place of requests.get/requests.post
+session = CachedSession()
 
 # 1. Get weather data for a city using API
 # Note: You may need to sign up for a free API key at openweathermap.org
@@ -0,0 +1,37 @@
+"""
+HTTP response cache for the day 12 exercises.
+
+The implementation is shared with the hackathon data-fetch project
+(hackathon/guided/beginner/02_data_fetch/http_cache.py); this module
+loads that file so there is a single copy, and keeps the exercises'
+cache in .http_cache/ next to this file.
+
+    from http_cache import CachedSession
+    session = CachedSession()
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+_SOURCE = (Path(__file__).resolve().parents[3]
+           / "hackathon" / "guided" / "beginner" / "02_data_fetch" / "http_cache.py")
+
+_spec = importlib.util.spec_from_file_location("_shared_http_cache", _SOURCE)
+_shared = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = _shared  # dataclasses look the module up while it loads
+_spec.loader.exec_module(_shared)
+
+DEFAULT_DIR = Path(__file__).with_name(".http_cache")
+
+HttpCache = _shared.HttpCache
+OfflineMiss = _shared.OfflineMiss
+cache_key = _shared.cache_key
+
+
+class CachedSession(_shared.CachedSession):
+    """The shared CachedSession, storing responses in this folder by default."""
+
+    def __init__(self, cache=None, **cache_options):
+        cache_options.setdefault("directory", DEFAULT_DIR)
+        super().__init__(cache, **cache_options)